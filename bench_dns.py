@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from modules.dns_checker import DNSChecker, dns_query
+from modules.fake_dns_server import FakeDNSServer
+from modules.utils import print_header, print_success, print_error, print_info, create_table
+
+DOMAINS = ["example.com", "example.org", "example.net", "test.local", "bench.local"]
+
+def bench_sequential(queries):
+    with FakeDNSServer(seed=1) as server:
+        start = time.perf_counter()
+        answered = sum(1 for _ in range(queries) if dns_query(server.host, "example.com", port=server.port, timeout=1.0) is not None)
+        elapsed = time.perf_counter() - start
+    return ["Sequencial (UDP)", queries, answered, f"{queries / elapsed:.0f}", f"{elapsed * 1000 / queries:.3f}"]
+
+def bench_concurrent(rounds, rate):
+    with FakeDNSServer(delay=0.005, jitter=0.004, seed=2) as server:
+        checker = DNSChecker(dns_servers=[server.host], test_domains=DOMAINS, dns_port=server.port)
+        benchmark = checker.benchmark_dns_servers(rounds=rounds, rate=rate, timeout=1.0)
+    result = benchmark['results'][0]
+    return ["Concorrente (asyncio, 5ms)", benchmark['queries'], result['received'], f"{benchmark['queries'] / benchmark['elapsed']:.0f}", f"{result['p50']:.3f}"]
+
+def bench_truncation(queries):
+    with FakeDNSServer(truncate=True, seed=3) as server:
+        start = time.perf_counter()
+        responses = [dns_query(server.host, "example.com", port=server.port, timeout=1.0) for _ in range(queries)]
+        elapsed = time.perf_counter() - start
+        tcp = server.stats['tcp']
+    answered = sum(1 for r in responses if r is not None and r['addresses'])
+    ok = answered == queries and tcp == queries
+    return ["Truncado -> TCP", queries, answered, f"{queries / elapsed:.0f}", f"{elapsed * 1000 / queries:.3f}"], ok
+
+def bench_timeouts(queries, loss, timeout, rate):
+    with FakeDNSServer(loss=loss, seed=4) as server:
+        checker = DNSChecker(dns_servers=[server.host], test_domains=DOMAINS, dns_port=server.port)
+        benchmark = checker.benchmark_dns_servers(rounds=queries // len(DOMAINS), rate=rate, timeout=timeout)
+        dropped = server.stats['dropped']
+    result = benchmark['results'][0]
+    bounded = benchmark['elapsed'] < result['sent'] / rate + timeout + 0.5
+    ok = result['sent'] - result['received'] == dropped and bounded
+    return ["Perda {:.0f}% (timeout {:.0f}ms)".format(loss * 100, timeout * 1000), result['sent'], result['received'], f"{result['sent'] / benchmark['elapsed']:.0f}", f"{result['p50']:.3f}"], ok
+
+def bench_nxdomain():
+    with FakeDNSServer(nxdomain=["test.local"], seed=5) as server:
+        checker = DNSChecker(dns_servers=[server.host], test_domains=DOMAINS, dns_port=server.port)
+        resolved = [checker._resolve_with_server(server.host, domain)[0] for domain in DOMAINS]
+    return resolved == [domain != "test.local" for domain in DOMAINS]
+
+class StandInHTTPHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        body = b"x" * 1024
+        time.sleep(self.server.delay)
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def bench_http(repeats):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHTTPHandler)
+    server.daemon_threads = True
+    server.delay = 0.002
+    server.connections = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        urls = [(f"Local {i}", f"http://127.0.0.1:{server.server_port}/{i}") for i in range(4)]
+        checker = DNSChecker()
+        results = checker.measure_http_timings(urls, repeats=repeats)
+        connections = server.connections
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    rows = []
+    for r in results:
+        if r['error']:
+            rows.append([r['label'], r['error'], "", "", ""])
+        else:
+            rows.append([r['label'], r['status'], f"{r['ttfb'] * 1000:.2f}", f"{r['session_cold'] * 1000:.2f}", f"{r['session_warm'] * 1000:.2f}"])
+    ok = all(not r['error'] and r['status'] == 200 for r in results) and connections == 2 * len(urls)
+    return rows, ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do DNSChecker contra um servidor DNS local")
+    parser.add_argument("--queries", type=int, default=2000, help="Consultas por cenário")
+    parser.add_argument("--rate", type=int, default=2000, help="Limite de consultas/s por servidor nos cenários concorrentes")
+    args = parser.parse_args()
+
+    print_header("BENCHMARK DE DNS (SERVIDOR LOCAL)")
+
+    rows = [bench_sequential(args.queries), bench_concurrent(args.queries // len(DOMAINS), args.rate)]
+    truncation_row, truncation_ok = bench_truncation(min(args.queries, 200))
+    timeout_row, timeout_ok = bench_timeouts(min(args.queries, 500), 0.2, 0.25, args.rate)
+    rows.extend([truncation_row, timeout_row])
+    print(create_table(["Cenário", "Enviadas", "Respondidas", "Consultas/s", "ms/consulta (p50)"], rows))
+
+    http_rows, http_ok = bench_http(10)
+    print(create_table(["HTTP local", "Status", "TTFB (ms)", "Sessão fria (ms)", "Keep-alive (ms)"], http_rows))
+
+    checks = [
+        ("Fallback para TCP em respostas truncadas", truncation_ok),
+        ("Perdas contabilizadas e tempo limitado pelo timeout", timeout_ok),
+        ("NXDOMAIN tratado como falha de resolução", bench_nxdomain()),
+        ("Sessão HTTP reutiliza a conexão", http_ok)
+    ]
+    failed = 0
+    for label, ok in checks:
+        if ok:
+            print_success(label)
+        else:
+            print_error(label)
+            failed += 1
+
+    print_info(f"{len(checks) - failed}/{len(checks)} verificações OK")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,6 +19,7 @@ from modules.driver_updater import DriverUpdater
 from modules.virus_scanner import VirusScanner
 from modules.memory_tester import MemoryTester
 from modules.disk_checker import DiskChecker
+from modules.cgroup_monitor import CgroupMonitor
 from modules.utils import get_os_type
 
 
@@ -65,11 +66,15 @@ class TerminalTecGUI(tk.Tk):
             "virus": VirusScanner(),
             "memory_tester": MemoryTester(),
             "disk_checker": DiskChecker(),
+            "cgroup": CgroupMonitor(),
         }
 
         self._build_ui()
         self.after(60, self._poll_log_queue)
 
+        self.modules["ram"].start_sampler()
+        self.after(1000, self._poll_memory_status)
+
         self.protocol("WM_DELETE_WINDOW", self._on_close)
 
     def _build_ui(self) -> None:
@@ -95,7 +100,7 @@ class TerminalTecGUI(tk.Tk):
         self._add_button(sidebar, 6, "Verificação de Disco", self._task_disk_check)
         self._add_button(sidebar, 7, "Monitoramento de RAM", self._task_ram)
         self._add_button(sidebar, 8, "Busca de Drivers", self._task_driver_updates)
-        # Backup removido
+        self._add_button(sidebar, 9, "Memória por Cgroup", self._task_cgroup)
         self._add_button(sidebar, 10, "Temp: Analisar", self._task_temp_analyze)
         self._add_button(sidebar, 11, "Temp: Limpar", self._task_temp_clean)
         self._add_button(sidebar, 12, "Teste de Velocidade", self._task_speed)
@@ -105,6 +110,10 @@ class TerminalTecGUI(tk.Tk):
         self._add_button(sidebar, 15, "Limpar Log", self._clear_log)
         self._add_button(sidebar, 16, "Salvar Log", self._save_log)
 
+        self._add_separator(sidebar, 17)
+        self.memory_status = tk.StringVar(value="RAM: --")
+        ttk.Label(sidebar, textvariable=self.memory_status, justify=tk.LEFT).grid(row=18, column=0, sticky="w")
+
         # Área de logs
         content = ttk.Frame(self, padding=(0, 8, 8, 8))
         content.grid(row=0, column=1, sticky="nsew")
@@ -140,6 +149,18 @@ class TerminalTecGUI(tk.Tk):
         finally:
             self.after(60, self._poll_log_queue)
 
+    def _poll_memory_status(self) -> None:
+        ram_monitor = self.modules["ram"]
+        sample = ram_monitor.sampler.latest()
+        if sample:
+            summary = ram_monitor.get_trend_summary(60)
+            self.memory_status.set(
+                f"RAM: {sample['percent']:.1f}%\n"
+                f"p95 (60s): {summary['p95']:.1f}%\n"
+                f"Tendência: {summary['slope_per_min']:+.2f}%/min"
+            )
+        self.after(1000, self._poll_memory_status)
+
     def _clear_log(self) -> None:
         self.text.delete("1.0", tk.END)
 
@@ -239,6 +260,9 @@ class TerminalTecGUI(tk.Tk):
     def _task_ram(self) -> None:
         self.modules["ram"].run_diagnostic()
 
+    def _task_cgroup(self) -> None:
+        self.modules["cgroup"].run_diagnostic()
+
     def _task_driver_updates(self) -> None:
         self.modules["driver_updater"].run_diagnostic()
 
@@ -302,6 +326,7 @@ class TerminalTecGUI(tk.Tk):
     # ==================== Eventos ====================
     def _on_close(self) -> None:
         try:
+            self.modules["ram"].stop_sampler()
             sys.stdout = self._orig_stdout
             sys.stderr = self._orig_stderr
         finally:
@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 
+import os
 import sys
 import argparse
-from modules.utils import print_header, print_success, print_error, print_info, print_warning, get_user_confirmation
+from modules.utils import print_header, print_success, print_error, print_info, print_warning, get_user_confirmation, is_linux
 from modules.dns_checker import DNSChecker
 from modules.disk_analyzer import DiskAnalyzer
 from modules.ram_monitor import RAMMonitor
@@ -13,6 +14,7 @@ from modules.driver_updater import DriverUpdater
 from modules.virus_scanner import VirusScanner
 from modules.memory_tester import MemoryTester
 from modules.disk_checker import DiskChecker
+from modules.cgroup_monitor import CgroupMonitor
 
 class TerminalTec:
     def __init__(self):
@@ -26,7 +28,8 @@ class TerminalTec:
             'driver_updater': DriverUpdater(),
             'virus': VirusScanner(),
             'memory_tester': MemoryTester(),
-            'disk_checker': DiskChecker()
+            'disk_checker': DiskChecker(),
+            'cgroup': CgroupMonitor()
         }
 
     def show_menu(self):
@@ -59,6 +62,14 @@ class TerminalTec:
         if get_user_confirmation("Deseja tentar corrigir problemas de DNS? (s/n): "):
             dns_checker.fix_dns_issues()
 
+        if get_user_confirmation("Deseja analisar o cache do resolvedor local? (s/n): "):
+            flush = get_user_confirmation("Limpar o cache do resolvedor antes de medir (requer privilégios)? (s/n): ")
+            dns_checker.report_resolver_cache(dns_checker.analyze_resolver_cache(flush=flush))
+
+        if get_user_confirmation("Deseja monitorar o DNS continuamente? (s/n): "):
+            minutes = input("Duração em minutos (Enter para até Ctrl+C): ").strip()
+            dns_checker.monitor_dns(duration=int(minutes) * 60 if minutes.isdigit() else None)
+
     def run_disk_analysis(self):
         disk_analyzer = self.modules['disk']
         disk_analyzer.run_diagnostic()
@@ -66,9 +77,27 @@ class TerminalTec:
         if get_user_confirmation("Deseja ver sugestões de limpeza? (s/n): "):
             disk_analyzer.cleanup_suggestions()
 
+        if get_user_confirmation("Deseja monitorar o I/O dos discos em tempo real? (s/n): "):
+            disk_analyzer.monitor_disk_io()
+
+        if get_user_confirmation("Deseja procurar diretórios com excesso de arquivos? (s/n): "):
+            path = input("Diretório para analisar (padrão: /): ").strip() or os.path.abspath(os.sep)
+            disk_analyzer.report_directory_entries(path)
+
     def run_ram_monitoring(self):
         ram_monitor = self.modules['ram']
         ram_monitor.run_diagnostic()
+
+        if is_linux() and get_user_confirmation("Deseja ver o consumo por container/cgroup? (s/n): "):
+            self.modules['cgroup'].run_diagnostic()
+
+        if is_linux():
+            window = ram_monitor.khugepaged_scan_window()
+            if get_user_confirmation(f"Deseja medir a atividade do khugepaged ({window:.0f} segundos)? (s/n): "):
+                ram_monitor.report_huge_pages(window)
+
+        if get_user_confirmation("Deseja procurar vazamentos de memória (5 minutos)? (s/n): "):
+            ram_monitor.report_memory_leaks()
         
         if get_user_confirmation("Deseja otimizar o uso de memória? (s/n): "):
             ram_monitor.optimize_memory()
@@ -137,6 +166,9 @@ class TerminalTec:
         virus_scanner = self.modules['virus']
         virus_scanner.run_diagnostic()
 
+        if get_user_confirmation("Deseja monitorar o I/O de disco por processo? (s/n): "):
+            virus_scanner.monitor_process_io()
+
     def run_memory_tester(self):
         memory_tester = self.modules['memory_tester']
         memory_tester.run_diagnostic()
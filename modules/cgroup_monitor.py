@@ -0,0 +1,187 @@
+import os
+import heapq
+import time
+from .utils import print_header, print_success, print_error, print_info, print_warning, format_bytes, format_percentage, create_table, is_linux
+
+class CgroupMonitor:
+    def __init__(self, root=None):
+        self.root = root
+        self.cgroups = []
+        self.limit_threshold = 90.0
+
+    def find_cgroup2_root(self):
+        if self.root:
+            return self.root
+        try:
+            with open("/proc/mounts") as f:
+                for line in f:
+                    fields = line.split()
+                    if len(fields) >= 3 and fields[2] == "cgroup2":
+                        return fields[1]
+        except OSError:
+            pass
+        return None
+
+    def _read_file(self, path):
+        try:
+            with open(path) as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _read_int(self, path):
+        content = self._read_file(path)
+        if content is None:
+            return None
+        content = content.strip()
+        if content == "max":
+            return None
+        try:
+            return int(content)
+        except ValueError:
+            return None
+
+    def _read_flat_keyed(self, path):
+        content = self._read_file(path)
+        values = {}
+        if not content:
+            return values
+        for line in content.splitlines():
+            key, _, value = line.partition(" ")
+            try:
+                values[key] = int(value)
+            except ValueError:
+                continue
+        return values
+
+    def _read_pressure(self, path):
+        content = self._read_file(path)
+        pressure = {}
+        if not content:
+            return pressure
+        for line in content.splitlines():
+            fields = line.split()
+            if not fields:
+                continue
+            try:
+                values = dict(field.split("=", 1) for field in fields[1:])
+                pressure[fields[0]] = float(values.get('avg10', 0.0))
+            except ValueError:
+                continue
+        return pressure
+
+    def _read_cgroup(self, path, root):
+        current = self._read_int(os.path.join(path, "memory.current"))
+        if current is None:
+            return None
+
+        memory_stat = self._read_flat_keyed(os.path.join(path, "memory.stat"))
+        pressure = self._read_pressure(os.path.join(path, "memory.pressure"))
+        events = self._read_flat_keyed(os.path.join(path, "memory.events.local")) or self._read_flat_keyed(os.path.join(path, "memory.events"))
+        cpu_stat = self._read_flat_keyed(os.path.join(path, "cpu.stat"))
+        limit = self._read_int(os.path.join(path, "memory.max"))
+        name = os.path.relpath(path, root)
+
+        return {
+            'name': "/" if name == "." else "/" + name,
+            'path': path,
+            'memory_current': current,
+            'memory_max': limit,
+            'limit_percent': current / limit * 100 if limit else None,
+            'anon': memory_stat.get('anon', 0),
+            'file': memory_stat.get('file', 0),
+            'pressure_some': pressure.get('some', 0.0),
+            'pressure_full': pressure.get('full', 0.0),
+            'oom_kill': events.get('oom_kill', 0),
+            'cpu_usage_usec': cpu_stat.get('usage_usec'),
+            'cpu_percent': None
+        }
+
+    def collect(self, interval=1.0):
+        root = self.find_cgroup2_root()
+        if not root or not os.path.isdir(root):
+            self.cgroups = []
+            return None
+
+        cgroups = []
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            info = self._read_cgroup(path, root)
+            if info:
+                cgroups.append(info)
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+            except OSError:
+                continue
+
+        if interval and cgroups:
+            start = time.perf_counter()
+            time.sleep(interval)
+            elapsed = time.perf_counter() - start
+            for cgroup in cgroups:
+                before = cgroup['cpu_usage_usec']
+                after = self._read_flat_keyed(os.path.join(cgroup['path'], "cpu.stat")).get('usage_usec')
+                if before is not None and after is not None:
+                    cgroup['cpu_percent'] = max(after - before, 0) / (elapsed * 1e6) * 100
+
+        self.cgroups = cgroups
+        return cgroups
+
+    def top_by_memory(self, limit=10):
+        return heapq.nlargest(limit, self.cgroups, key=lambda c: c['memory_current'])
+
+    def top_by_pressure(self, limit=10):
+        pressured = [c for c in self.cgroups if c['pressure_some'] > 0 or c['pressure_full'] > 0]
+        return heapq.nlargest(limit, pressured, key=lambda c: (c['pressure_full'], c['pressure_some']))
+
+    def near_limit(self):
+        return [c for c in self.cgroups if c['limit_percent'] is not None and c['limit_percent'] >= self.limit_threshold]
+
+    def run_diagnostic(self, limit=10):
+        print_header("MEMÓRIA E CPU POR CGROUP")
+        print_info("Esta ferramenta verifica:")
+        print_info("• Consumo de memória por container/slice")
+        print_info("• Pressão de memória por cgroup")
+        print_info("• Cgroups próximos do limite memory.max")
+        print()
+
+        if not is_linux():
+            print_warning("Contabilidade por cgroup disponível apenas no Linux")
+            return False
+
+        if self.collect() is None:
+            print_error("Hierarquia cgroup v2 não encontrada")
+            return False
+
+        memory_rows = []
+        for c in self.top_by_memory(limit):
+            memory_rows.append([
+                c['name'][:60],
+                format_bytes(c['memory_current']),
+                format_bytes(c['anon']),
+                format_bytes(c['file']),
+                format_bytes(c['memory_max']) if c['memory_max'] else "sem limite",
+                f"{c['cpu_percent']:.1f}%" if c['cpu_percent'] is not None else "N/A"
+            ])
+        print_info("Cgroups por uso de memória:")
+        print(create_table(["Cgroup", "Memória", "Anônima", "Cache", "Limite", "CPU"], memory_rows))
+
+        pressured = self.top_by_pressure(limit)
+        if pressured:
+            print_info("Cgroups por pressão de memória (avg10):")
+            pressure_rows = [[c['name'][:60], f"{c['pressure_some']:.2f}%", f"{c['pressure_full']:.2f}%", c['oom_kill']] for c in pressured]
+            print(create_table(["Cgroup", "Some", "Full", "OOM kills"], pressure_rows))
+        else:
+            print_success("Nenhum cgroup com pressão de memória")
+
+        for c in self.near_limit():
+            print_warning(f"{c['name']} usando {format_percentage(c['memory_current'], c['memory_max'])} do memory.max ({format_bytes(c['memory_max'])})")
+        for c in self.cgroups:
+            if c['oom_kill']:
+                print_warning(f"{c['name']} teve {c['oom_kill']} processo(s) finalizado(s) por OOM")
+
+        return True
@@ -1,7 +1,10 @@
 import os
+import heapq
 import psutil
 import shutil
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from .utils import print_header, print_success, print_error, print_info, print_warning, format_bytes, format_percentage, create_table, run_command, get_os_type
 
 class DiskAnalyzer:
@@ -9,6 +12,9 @@ class DiskAnalyzer:
         self.disk_partitions = []
         self.disk_usage = {}
         self.disk_health = {}
+        self.disk_io_history = {}
+        self.disk_io_history_size = 3600
+        self.huge_directory_threshold = 10000
 
     def get_disk_partitions(self):
         try:
@@ -32,9 +38,27 @@ class DiskAnalyzer:
                     'free': usage.free,
                     'percent': usage.percent
                 }
+                self.disk_usage[partition.device].update(self._get_inode_usage(partition.mountpoint))
             except Exception as e:
                 print_warning(f"Erro ao analisar {partition.device}: {e}")
 
+    def _get_inode_usage(self, mountpoint):
+        if not hasattr(os, "statvfs"):
+            return {}
+        try:
+            stats = os.statvfs(mountpoint)
+        except OSError:
+            return {}
+        if not stats.f_files:
+            return {}
+        used = stats.f_files - stats.f_ffree
+        return {
+            'inodes_total': stats.f_files,
+            'inodes_used': used,
+            'inodes_free': stats.f_favail,
+            'inodes_percent': used / stats.f_files * 100
+        }
+
     def check_disk_health(self):
         self.disk_health = {}
         
@@ -62,6 +86,161 @@ class DiskAnalyzer:
             
             self.disk_health[device] = health_info
 
+    def _read_disk_io_counters(self):
+        counters = {}
+        if os.path.exists("/proc/diskstats"):
+            try:
+                with open("/proc/diskstats") as f:
+                    for line in f:
+                        fields = line.split()
+                        if len(fields) < 14:
+                            continue
+                        name = fields[2]
+                        if name.startswith(("loop", "ram", "zram")):
+                            continue
+                        if not os.path.exists(os.path.join("/sys/block", name.replace("/", "!"))):
+                            continue
+                        values = [int(v) for v in fields[3:14]]
+                        counters[name] = {
+                            'read_count': values[0],
+                            'write_count': values[4],
+                            'read_bytes': values[2] * 512,
+                            'write_bytes': values[6] * 512,
+                            'read_time': values[3],
+                            'write_time': values[7],
+                            'busy_time': values[9],
+                            'weighted_time': values[10]
+                        }
+                return counters
+            except (OSError, ValueError):
+                counters = {}
+
+        try:
+            per_disk = psutil.disk_io_counters(perdisk=True) or {}
+        except Exception:
+            per_disk = {}
+        for name, io in per_disk.items():
+            counters[name] = {
+                'read_count': io.read_count,
+                'write_count': io.write_count,
+                'read_bytes': io.read_bytes,
+                'write_bytes': io.write_bytes,
+                'read_time': getattr(io, 'read_time', 0),
+                'write_time': getattr(io, 'write_time', 0),
+                'busy_time': getattr(io, 'busy_time', None),
+                'weighted_time': None
+            }
+        return counters
+
+    def _compute_disk_io_rates(self, previous, current, elapsed):
+        rates = {}
+        if elapsed <= 0:
+            return rates
+        elapsed_ms = elapsed * 1000
+
+        for device, cur in current.items():
+            prev = previous.get(device)
+            if not prev:
+                continue
+
+            def delta(key):
+                if cur[key] is None or prev[key] is None:
+                    return None
+                return max(cur[key] - prev[key], 0)
+
+            reads = delta('read_count')
+            writes = delta('write_count')
+            ios = reads + writes
+            io_time = delta('read_time') + delta('write_time')
+            busy = delta('busy_time')
+            weighted = delta('weighted_time')
+
+            rates[device] = {
+                'read_iops': reads / elapsed,
+                'write_iops': writes / elapsed,
+                'read_bps': delta('read_bytes') / elapsed,
+                'write_bps': delta('write_bytes') / elapsed,
+                'await_ms': io_time / ios if ios else 0.0,
+                'queue_depth': weighted / elapsed_ms if weighted is not None else None,
+                'util': min(busy / elapsed_ms * 100, 100.0) if busy is not None else None
+            }
+        return rates
+
+    def _record_disk_io_rates(self, rates, timestamp):
+        for device, device_rates in rates.items():
+            history = self.disk_io_history.get(device)
+            if history is None:
+                history = deque(maxlen=self.disk_io_history_size)
+                self.disk_io_history[device] = history
+            history.append(dict(device_rates, timestamp=timestamp))
+
+    def sample_disk_io(self, interval=1.0):
+        try:
+            previous = self._read_disk_io_counters()
+            start = time.perf_counter()
+            time.sleep(interval)
+            current = self._read_disk_io_counters()
+            elapsed = time.perf_counter() - start
+        except Exception as e:
+            print_error(f"Erro ao amostrar I/O de disco: {e}")
+            return {}
+
+        rates = self._compute_disk_io_rates(previous, current, elapsed)
+        self._record_disk_io_rates(rates, time.time())
+        return rates
+
+    def _disk_io_table(self, rates):
+        rows = []
+        for device in sorted(rates):
+            r = rates[device]
+            rows.append([
+                device,
+                f"{r['read_iops']:.1f}",
+                f"{r['write_iops']:.1f}",
+                format_bytes(r['read_bps']),
+                format_bytes(r['write_bps']),
+                f"{r['await_ms']:.2f}",
+                f"{r['queue_depth']:.2f}" if r['queue_depth'] is not None else "N/A",
+                f"{r['util']:.1f}%" if r['util'] is not None else "N/A"
+            ])
+        headers = ["Dispositivo", "Leituras/s", "Escritas/s", "Leitura/s", "Escrita/s", "Await (ms)", "Fila", "Util"]
+        return create_table(headers, rows)
+
+    def _report_busy_devices(self, rates):
+        for device, r in sorted(rates.items()):
+            if r['util'] is not None and r['util'] > 80:
+                print_warning(f"Dispositivo {device} com {r['util']:.1f}% de utilização - SATURADO")
+            if r['await_ms'] > 50:
+                print_warning(f"Dispositivo {device} com latência média de {r['await_ms']:.1f}ms")
+
+    def monitor_disk_io(self, duration=60, interval=1.0):
+        print_header("Monitoramento de I/O de Disco")
+        print_info(f"Monitorando por {duration} segundos... (Ctrl+C para parar)")
+
+        try:
+            previous = self._read_disk_io_counters()
+            last = time.perf_counter()
+            end_time = last + duration
+            while time.perf_counter() < end_time:
+                time.sleep(interval)
+                current = self._read_disk_io_counters()
+                now = time.perf_counter()
+                rates = self._compute_disk_io_rates(previous, current, now - last)
+                self._record_disk_io_rates(rates, time.time())
+                previous, last = current, now
+
+                print("\033[2J\033[H", end="")
+                print_header("Monitoramento de I/O de Disco")
+                print(self._disk_io_table(rates))
+                self._report_busy_devices(rates)
+
+            print_success("Monitoramento concluído")
+        except KeyboardInterrupt:
+            print()
+            print_info("Monitoramento interrompido pelo usuário")
+
+        return True
+
     def get_large_files(self, path, limit=10):
         large_files = []
         try:
@@ -111,6 +290,92 @@ class DiskAnalyzer:
         old_files.sort(key=lambda x: x[1])
         return old_files[:limit]
 
+    def _scan_single_directory(self, path, root_device):
+        entries = 0
+        files = 0
+        total_size = 0
+        subdirs = []
+        with os.scandir(path) as it:
+            for entry in it:
+                entries += 1
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.stat(follow_symlinks=False).st_dev == root_device:
+                            subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        files += 1
+                        total_size += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+        stats = {
+            'path': path,
+            'entries': entries,
+            'files': files,
+            'size': total_size,
+            'avg_file_size': total_size / files if files else 0
+        }
+        return stats, subdirs
+
+    def _scan_directory_tree(self, root_path, root_device, min_entries):
+        results = []
+        stack = [root_path]
+        while stack:
+            try:
+                stats, subdirs = self._scan_single_directory(stack.pop(), root_device)
+            except OSError:
+                continue
+            stack.extend(subdirs)
+            if stats['entries'] >= min_entries:
+                results.append(stats)
+        return results
+
+    def scan_directory_entries(self, path, limit=10, min_entries=100, max_workers=8):
+        try:
+            root_device = os.stat(path).st_dev
+            root_stats, subdirs = self._scan_single_directory(path, root_device)
+        except OSError as e:
+            print_error(f"Erro ao analisar {path}: {e}")
+            return [], []
+
+        directories = [root_stats] if root_stats['entries'] >= min_entries else []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self._scan_directory_tree, subdir, root_device, min_entries) for subdir in subdirs]
+            for future in futures:
+                directories.extend(future.result())
+
+        by_entries = heapq.nlargest(limit, directories, key=lambda d: d['entries'])
+        with_files = [d for d in directories if d['files'] >= min_entries]
+        by_small_files = heapq.nsmallest(limit, with_files, key=lambda d: d['avg_file_size'])
+        return by_entries, by_small_files
+
+    def report_directory_entries(self, path, limit=10):
+        print_header("Análise de Inodes e Arquivos Pequenos")
+        print_info(f"Varrendo {path}...")
+
+        inodes = self._get_inode_usage(path)
+        if inodes:
+            print_info(f"Inodes: {inodes['inodes_used']:,} usados de {inodes['inodes_total']:,} ({inodes['inodes_percent']:.1f}%)")
+
+        by_entries, by_small_files = self.scan_directory_entries(path, limit)
+        if not by_entries:
+            print_success("Nenhum diretório com grande número de entradas encontrado")
+            return True
+
+        print_info("Diretórios com mais entradas:")
+        rows = [[d['entries'], d['files'], format_bytes(d['avg_file_size']), d['path']] for d in by_entries]
+        print(create_table(["Entradas", "Arquivos", "Tamanho Médio", "Diretório"], rows))
+
+        if by_small_files:
+            print_info("Diretórios com menor tamanho médio de arquivo:")
+            rows = [[d['files'], format_bytes(d['avg_file_size']), format_bytes(d['size']), d['path']] for d in by_small_files]
+            print(create_table(["Arquivos", "Tamanho Médio", "Total", "Diretório"], rows))
+
+        for d in by_entries:
+            if d['entries'] >= self.huge_directory_threshold:
+                print_warning(f"{d['path']} possui {d['entries']:,} entradas - torna varreduras lentas e consome inodes")
+
+        return True
+
     def defragment_disk(self, drive_letter):
         if get_os_type() == "windows":
             print_info(f"Desfragmentando disco {drive_letter}...")
@@ -154,12 +419,19 @@ class DiskAnalyzer:
                     format_bytes(usage['used']),
                     format_bytes(usage['free']),
                     f"{usage['percent']:.1f}%",
+                    f"{usage['inodes_percent']:.1f}%" if 'inodes_percent' in usage else "N/A",
                     health['status']
                 ])
 
-        headers = ["Dispositivo", "Ponto de Montagem", "Total", "Usado", "Livre", "Uso", "Saúde"]
+        headers = ["Dispositivo", "Ponto de Montagem", "Total", "Usado", "Livre", "Uso", "Inodes", "Saúde"]
         print(create_table(headers, partition_data))
 
+        io_rates = self.sample_disk_io(1.0)
+        if io_rates:
+            print_info("Atividade de I/O por dispositivo (amostra de 1s):")
+            print(self._disk_io_table(io_rates))
+            self._report_busy_devices(io_rates)
+
         print_info("Análise de Espaço:")
         for device, usage in self.disk_usage.items():
             if usage['percent'] > 90:
@@ -169,6 +441,12 @@ class DiskAnalyzer:
             else:
                 print_success(f"Disco {device} com {usage['percent']:.1f}% de uso - OK")
 
+            inodes_percent = usage.get('inodes_percent')
+            if inodes_percent is not None and inodes_percent > 90:
+                print_error(f"Disco {device} com {inodes_percent:.1f}% dos inodes em uso - CRÍTICO")
+            elif inodes_percent is not None and inodes_percent > 80:
+                print_warning(f"Disco {device} com {inodes_percent:.1f}% dos inodes em uso - ATENÇÃO")
+
         print_info("Arquivos Grandes (>100MB):")
         for partition in self.disk_partitions:
             if partition.mountpoint == "C:\\":
@@ -1,12 +1,24 @@
 import os
+import json
+import shutil
+import sqlite3
 import subprocess
 import time
-from .utils import print_header, print_success, print_error, print_info, print_warning, run_command, get_os_type, create_table, is_admin
+from concurrent.futures import ThreadPoolExecutor
+from .utils import print_header, print_success, print_error, print_info, print_warning, run_command, get_os_type, create_table, is_admin, get_data_directory
+
+SMART_SKIP_PREFIXES = ("loop", "ram", "zram", "dm-", "md", "sr", "fd", "nbd", "rbd")
+SMART_HISTORY_FIELDS = ("reallocated", "pending", "media_errors", "wear", "temperature", "data_written", "power_on_hours")
+SECONDS_PER_WEEK = 7 * 24 * 3600
 
 class DiskChecker:
     def __init__(self):
         self.check_results = {}
         self.disk_errors = []
+        self.smart_data = []
+        self.temperature_limit = 60
+        self.wear_limit = 80
+        self.smart_trends = []
 
     def run_chkdsk_windows(self, drive="C:"):
         try:
@@ -152,15 +164,310 @@ class DiskChecker:
             print_error(f"Erro ao verificar saúde: {e}")
             return False
 
+    def list_block_devices(self, sys_block="/sys/block"):
+        devices = []
+        try:
+            names = sorted(os.listdir(sys_block))
+        except OSError:
+            return devices
+        for name in names:
+            if name.startswith(SMART_SKIP_PREFIXES):
+                continue
+            try:
+                with open(os.path.join(sys_block, name, "size")) as f:
+                    if int(f.read().strip() or 0) == 0:
+                        continue
+            except (OSError, ValueError):
+                continue
+            devices.append(name)
+        return devices
+
+    def _run_smartctl(self, device, timeout=60):
+        try:
+            result = subprocess.run(
+                ["smartctl", "--json", "-a", f"/dev/{device}"],
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            return {'error': str(e)}
+        try:
+            return json.loads(result.stdout)
+        except ValueError:
+            return {'error': (result.stderr or result.stdout).strip() or f"smartctl retornou {result.returncode}"}
+
+    def parse_smart_json(self, device, data):
+        record = {
+            'device': device,
+            'model': data.get('model_name') or data.get('model_family'),
+            'serial': data.get('serial_number'),
+            'protocol': (data.get('device') or {}).get('protocol'),
+            'passed': (data.get('smart_status') or {}).get('passed'),
+            'temperature': (data.get('temperature') or {}).get('current'),
+            'power_on_hours': (data.get('power_on_time') or {}).get('hours'),
+            'reallocated': None,
+            'pending': None,
+            'uncorrectable': None,
+            'wear': None,
+            'media_errors': None,
+            'data_written': None,
+            'error': None
+        }
+        messages = [m.get('string', '') for m in (data.get('smartctl') or {}).get('messages', []) if m.get('severity') == 'error']
+        if 'error' in data:
+            record['error'] = data['error']
+        elif messages and record['passed'] is None:
+            record['error'] = messages[0]
+
+        nvme = data.get('nvme_smart_health_information_log')
+        if nvme:
+            record['wear'] = nvme.get('percentage_used')
+            record['media_errors'] = nvme.get('media_errors')
+            if nvme.get('data_units_written') is not None:
+                record['data_written'] = nvme['data_units_written'] * 512000
+            if record['temperature'] is None:
+                record['temperature'] = nvme.get('temperature')
+
+        attributes = {a.get('id'): a for a in (data.get('ata_smart_attributes') or {}).get('table', [])}
+        if attributes:
+            def raw(attribute_id):
+                attribute = attributes.get(attribute_id)
+                return (attribute.get('raw') or {}).get('value') if attribute else None
+
+            record['reallocated'] = raw(5)
+            record['pending'] = raw(197)
+            record['uncorrectable'] = raw(198)
+            for wear_id in (177, 231, 233, 202, 169):
+                if wear_id in attributes and attributes[wear_id].get('value') is not None:
+                    record['wear'] = max(100 - attributes[wear_id]['value'], 0)
+                    break
+            if raw(241) is not None:
+                record['data_written'] = raw(241) * data.get('logical_block_size', 512)
+        return record
+
+    def collect_smart_data(self, devices=None, max_workers=8):
+        devices = devices if devices is not None else self.list_block_devices()
+        if not devices:
+            self.smart_data = []
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(devices))) as executor:
+            raw = list(executor.map(self._run_smartctl, devices))
+        self.smart_data = [self.parse_smart_json(device, data) for device, data in zip(devices, raw)]
+        return self.smart_data
+
+    def _smart_warnings(self, record):
+        warnings = []
+        if record['passed'] is False:
+            warnings.append("autoteste SMART FALHOU - faça backup imediatamente")
+        if record['reallocated']:
+            warnings.append(f"{record['reallocated']} setor(es) realocado(s)")
+        if record['pending']:
+            warnings.append(f"{record['pending']} setor(es) pendente(s)")
+        if record['uncorrectable']:
+            warnings.append(f"{record['uncorrectable']} setor(es) incorrigível(is)")
+        if record['media_errors']:
+            warnings.append(f"{record['media_errors']} erro(s) de mídia")
+        if record['wear'] is not None and record['wear'] >= self.wear_limit:
+            warnings.append(f"desgaste em {record['wear']}%")
+        if record['temperature'] is not None and record['temperature'] >= self.temperature_limit:
+            warnings.append(f"temperatura alta ({record['temperature']}°C)")
+        return warnings
+
+    def report_smart_summary(self, records):
+        def value(v, suffix=""):
+            return f"{v}{suffix}" if v is not None else "-"
+
+        rows = []
+        for r in records:
+            if r['error']:
+                status = "ERRO"
+            elif r['passed'] is None:
+                status = "N/A"
+            else:
+                status = "OK" if r['passed'] else "FALHA"
+            rows.append([
+                r['device'],
+                (r['model'] or "-")[:28],
+                r['serial'] or "-",
+                status,
+                value(r['temperature'], "°C"),
+                value(r['power_on_hours']),
+                value(r['reallocated']),
+                value(r['pending']),
+                value(r['wear'], "%"),
+                value(r['media_errors'])
+            ])
+        print(create_table(["Disco", "Modelo", "Serial", "SMART", "Temp.", "Horas", "Realocados", "Pendentes", "Desgaste", "Erros mídia"], rows))
+
+        healthy = True
+        for r in records:
+            if r['error']:
+                print_warning(f"{r['device']}: {r['error']}")
+                continue
+            for warning in self._smart_warnings(r):
+                print_error(f"{r['device']}: {warning}")
+                healthy = False
+        if healthy and any(not r['error'] for r in records):
+            print_success("Nenhum problema SMART encontrado")
+        return healthy
+
+    def _smart_history_path(self):
+        return os.path.join(get_data_directory(), "smart_history.db")
+
+    def _open_smart_history(self, path=None):
+        conn = sqlite3.connect(path or self._smart_history_path())
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS smart_samples ("
+            "serial TEXT NOT NULL, ts REAL NOT NULL, model TEXT, "
+            "reallocated INTEGER, pending INTEGER, media_errors INTEGER, wear REAL, "
+            "temperature REAL, data_written INTEGER, power_on_hours INTEGER, "
+            "PRIMARY KEY (serial, ts)) WITHOUT ROWID"
+        )
+        return conn
+
+    def record_smart_history(self, records, timestamp=None, path=None):
+        timestamp = timestamp or time.time()
+        rows = [
+            (r['serial'], timestamp, r['model']) + tuple(r[field] for field in SMART_HISTORY_FIELDS)
+            for r in records if r['serial'] and not r['error']
+        ]
+        if not rows:
+            return 0
+        conn = self._open_smart_history(path)
+        try:
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO smart_samples VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        finally:
+            conn.close()
+        return len(rows)
+
+    def _smart_sample(self, conn, serial, since, newest=False):
+        order = "DESC" if newest else "ASC"
+        return conn.execute(
+            f"SELECT * FROM smart_samples WHERE serial = ? AND ts >= ? ORDER BY ts {order} LIMIT 1",
+            (serial, since)
+        ).fetchone()
+
+    def _growth_per_week(self, start, end, field):
+        if start is None or end is None or start[field] is None or end[field] is None:
+            return None
+        elapsed = end['ts'] - start['ts']
+        if elapsed <= 0:
+            return None
+        return (end[field] - start[field]) / elapsed * SECONDS_PER_WEEK
+
+    def get_smart_trends(self, serials, now=None, recent_days=30, window_days=180, path=None):
+        now = now or time.time()
+        recent_since = now - recent_days * 86400
+        window_since = now - window_days * 86400
+        trends = []
+        conn = self._open_smart_history(path)
+        try:
+            for serial in serials:
+                first = self._smart_sample(conn, serial, window_since)
+                middle = self._smart_sample(conn, serial, recent_since)
+                last = self._smart_sample(conn, serial, window_since, newest=True)
+                if first is None or last is None or first['ts'] == last['ts']:
+                    trends.append({'serial': serial, 'samples': 1 if last else 0, 'accelerating': []})
+                    continue
+
+                samples, excursions, max_temperature = conn.execute(
+                    "SELECT COUNT(*), SUM(temperature >= ?), MAX(temperature) FROM smart_samples WHERE serial = ? AND ts >= ?",
+                    (self.temperature_limit, serial, window_since)
+                ).fetchone()
+
+                trend = {
+                    'serial': serial,
+                    'model': last['model'],
+                    'samples': samples,
+                    'days': (last['ts'] - first['ts']) / 86400,
+                    'temperature_excursions': excursions or 0,
+                    'max_temperature': max_temperature,
+                    'wear_per_tb': None,
+                    'accelerating': []
+                }
+                for field in ("reallocated", "pending", "media_errors"):
+                    trend[f"{field}_per_week"] = self._growth_per_week(first, last, field)
+                    if middle is None or middle['ts'] <= first['ts'] or middle['ts'] >= last['ts']:
+                        continue
+                    previous_rate = self._growth_per_week(first, middle, field)
+                    recent_rate = self._growth_per_week(middle, last, field)
+                    if recent_rate and recent_rate > 0 and (not previous_rate or recent_rate > previous_rate * 2):
+                        trend['accelerating'].append(field)
+
+                if None not in (first['wear'], last['wear'], first['data_written'], last['data_written']):
+                    written_tb = (last['data_written'] - first['data_written']) / 1e12
+                    if written_tb > 0:
+                        trend['wear_per_tb'] = (last['wear'] - first['wear']) / written_tb
+                trends.append(trend)
+        finally:
+            conn.close()
+        self.smart_trends = trends
+        return trends
+
+    def report_smart_trends(self, trends):
+        def rate(value):
+            return f"{value:+.2f}" if value is not None else "-"
+
+        rows = []
+        for t in trends:
+            if t['samples'] < 2:
+                continue
+            rows.append([
+                t['serial'],
+                f"{t['days']:.0f}d / {t['samples']}",
+                rate(t['reallocated_per_week']),
+                rate(t['pending_per_week']),
+                rate(t['media_errors_per_week']),
+                f"{t['wear_per_tb']:.3f}%" if t['wear_per_tb'] is not None else "-",
+                f"{t['temperature_excursions']} (máx {t['max_temperature']:.0f}°C)" if t['max_temperature'] is not None else "-"
+            ])
+        if not rows:
+            print_info("Histórico SMART insuficiente para tendências (execute novamente em outro dia)")
+            return True
+
+        print_info("Tendências SMART (por semana):")
+        print(create_table(["Serial", "Período / amostras", "Realocados", "Pendentes", "Erros mídia", "Desgaste/TB", "Excursões de temp."], rows))
+
+        stable = True
+        labels = {'reallocated': "setores realocados", 'pending': "setores pendentes", 'media_errors': "erros de mídia"}
+        for t in trends:
+            if t['accelerating']:
+                stable = False
+                print_error(f"{t['serial']}: crescimento acelerando em {', '.join(labels[f] for f in t['accelerating'])} - risco de falha, faça backup")
+        if stable:
+            print_success("Nenhum disco com degradação acelerando")
+        return stable
+
     def check_disk_health_linux(self):
         try:
             print_info("Verificando saúde do disco...")
-            
-            success, output, error = run_command("smartctl -a /dev/sda")
-            if success:
-                print_info("Informações SMART do disco:")
-                print(output)
-            
+
+            if not shutil.which("smartctl"):
+                print_error("smartctl não encontrado")
+                print_info("Instale smartmontools: sudo apt install smartmontools")
+                return False
+
+            devices = self.list_block_devices()
+            if not devices:
+                print_warning("Nenhum disco encontrado em /sys/block")
+                return False
+
+            records = self.collect_smart_data(devices)
+            if not is_admin():
+                print_warning("Execute como root para ler os dados SMART de todos os discos")
+
+            print_info(f"Informações SMART de {len(records)} disco(s):")
+            self.report_smart_summary(records)
+
+            try:
+                self.record_smart_history(records)
+                self.report_smart_trends(self.get_smart_trends([r['serial'] for r in records if r['serial'] and not r['error']]))
+            except sqlite3.Error as e:
+                print_warning(f"Não foi possível usar o histórico SMART: {e}")
             return True
         except Exception as e:
             print_error(f"Erro ao verificar saúde: {e}")
@@ -1,13 +1,365 @@
+import os
+import ssl
+import json
 import socket
+import struct
+import random
+import asyncio
+import statistics
 import subprocess
 import time
-import shutil
+import http.client
+import urllib.parse
 import requests
-from .utils import print_header, print_success, print_error, print_info, print_warning, run_command, get_os_type
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from .utils import print_header, print_success, print_error, print_info, print_warning, run_command, get_os_type, create_table, get_data_directory
 
-class DNSChecker:
+DNS_PORT = 53
+DNS_QTYPES = {'A': 1, 'AAAA': 28, 'CNAME': 5}
+DNS_RCODES = {0: "NOERROR", 1: "FORMERR", 2: "SERVFAIL", 3: "NXDOMAIN", 4: "NOTIMP", 5: "REFUSED"}
+
+def build_dns_query(query_id, domain, qtype="A"):
+    header = struct.pack("!HHHHHH", query_id, 0x0100, 1, 0, 0, 0)
+    question = b""
+    for label in domain.strip(".").split("."):
+        if not label:
+            continue
+        try:
+            encoded = label.encode("idna")
+        except UnicodeError as e:
+            raise ValueError(f"rótulo DNS inválido: {label!r}") from e
+        if len(encoded) > 63:
+            raise ValueError(f"rótulo DNS com mais de 63 bytes: {label!r}")
+        question += bytes([len(encoded)]) + encoded
+    if len(question) + 1 > 255:
+        raise ValueError(f"nome DNS com mais de 255 bytes: {domain!r}")
+    return header + question + b"\x00" + struct.pack("!HH", DNS_QTYPES[qtype], 1)
+
+def _skip_dns_name(data, offset):
+    while True:
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            return offset + 2
+        offset += 1
+        if length == 0:
+            return offset
+        offset += length
+
+def parse_dns_response(data, query_id=None):
+    if len(data) < 12:
+        return None
+    response_id, flags, qdcount, ancount, _nscount, _arcount = struct.unpack("!HHHHHH", data[:12])
+    if query_id is not None and response_id != query_id:
+        return None
+    if not flags & 0x8000:
+        return None
+
+    result = {
+        'id': response_id,
+        'rcode': flags & 0x000F,
+        'truncated': bool(flags & 0x0200),
+        'addresses': [],
+        'ttl': None
+    }
+    try:
+        offset = 12
+        for _ in range(qdcount):
+            offset = _skip_dns_name(data, offset) + 4
+        for _ in range(ancount):
+            offset = _skip_dns_name(data, offset)
+            rtype, _rclass, ttl, rdlength = struct.unpack("!HHIH", data[offset:offset + 10])
+            offset += 10
+            rdata = data[offset:offset + rdlength]
+            offset += rdlength
+            if rtype == 1 and rdlength == 4:
+                result['addresses'].append(socket.inet_ntop(socket.AF_INET, rdata))
+            elif rtype == 28 and rdlength == 16:
+                result['addresses'].append(socket.inet_ntop(socket.AF_INET6, rdata))
+            else:
+                continue
+            result['ttl'] = ttl if result['ttl'] is None else min(result['ttl'], ttl)
+    except (IndexError, struct.error):
+        return None
+    return result
+
+def _recv_exact(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise ConnectionError("conexão encerrada pelo servidor")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+def _dns_query_tcp(server, port, packet, query_id, timeout):
+    family = socket.AF_INET6 if ":" in server else socket.AF_INET
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect((server, port))
+        start = time.perf_counter()
+        sock.sendall(struct.pack("!H", len(packet)) + packet)
+        length = struct.unpack("!H", _recv_exact(sock, 2))[0]
+        data = _recv_exact(sock, length)
+        return parse_dns_response(data, query_id), time.perf_counter() - start
+
+def _dns_query_udp(sock, packet, query_id, timeout):
+    start = time.perf_counter()
+    deadline = start + timeout
+    sock.send(packet)
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            raise socket.timeout()
+        sock.settimeout(remaining)
+        data = sock.recv(4096)
+        received = time.perf_counter()
+        response = parse_dns_response(data, query_id)
+        if response is not None:
+            return response, received - start
+
+def dns_query(server, domain, qtype="A", timeout=2.0, retries=1, port=DNS_PORT, use_tcp=False):
+    family = socket.AF_INET6 if ":" in server else socket.AF_INET
+    for attempt in range(1, retries + 2):
+        query_id = random.getrandbits(16)
+        try:
+            packet = build_dns_query(query_id, domain, qtype)
+        except ValueError:
+            return None
+        try:
+            if use_tcp:
+                response, rtt = _dns_query_tcp(server, port, packet, query_id, timeout)
+            else:
+                with socket.socket(family, socket.SOCK_DGRAM) as sock:
+                    sock.connect((server, port))
+                    response, rtt = _dns_query_udp(sock, packet, query_id, timeout)
+                if response['truncated']:
+                    response, tcp_rtt = _dns_query_tcp(server, port, packet, query_id, timeout)
+                    rtt += tcp_rtt
+        except (socket.timeout, OSError):
+            continue
+        if response is None:
+            continue
+        response['rtt'] = rtt
+        response['attempts'] = attempt
+        return response
+    return None
+
+def _latency_percentile(ordered, p):
+    if not ordered:
+        return None
+    rank = (len(ordered) - 1) * p / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+class _DNSDatagramProtocol(asyncio.DatagramProtocol):
     def __init__(self):
-        self.dns_servers = [
+        self.pending = {}
+
+    def datagram_received(self, data, addr):
+        if len(data) < 2:
+            return
+        future = self.pending.get(struct.unpack("!H", data[:2])[0])
+        if future is not None and not future.done():
+            future.set_result((time.perf_counter(), data))
+
+    def error_received(self, exc):
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(exc)
+
+async def _async_dns_query(transport, protocol, domain, qtype, timeout):
+    loop = asyncio.get_running_loop()
+    query_id = random.getrandbits(16)
+    while query_id in protocol.pending:
+        query_id = random.getrandbits(16)
+    try:
+        packet = build_dns_query(query_id, domain, qtype)
+    except ValueError:
+        return None
+    future = loop.create_future()
+    protocol.pending[query_id] = future
+    try:
+        start = time.perf_counter()
+        transport.sendto(packet)
+        received, data = await asyncio.wait_for(future, timeout)
+        response = parse_dns_response(data, query_id)
+        if response is None:
+            return None
+        response['rtt'] = received - start
+        return response
+    except (asyncio.TimeoutError, OSError):
+        return None
+    finally:
+        protocol.pending.pop(query_id, None)
+
+async def _benchmark_server(server, port, domains, rounds, rate, timeout, qtype):
+    loop = asyncio.get_running_loop()
+    family = socket.AF_INET6 if ":" in server else socket.AF_INET
+    try:
+        transport, protocol = await loop.create_datagram_endpoint(_DNSDatagramProtocol, remote_addr=(server, port), family=family)
+    except OSError:
+        return server, [None] * (len(domains) * rounds)
+
+    try:
+        interval = 1.0 / rate if rate else 0.0
+        tasks = []
+        start = time.perf_counter()
+        for i in range(rounds):
+            for domain in domains:
+                if interval:
+                    delay = start + len(tasks) * interval - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                tasks.append(loop.create_task(_async_dns_query(transport, protocol, domain, qtype, timeout)))
+        return server, await asyncio.gather(*tasks)
+    finally:
+        transport.close()
+
+async def _benchmark_all(servers, port, domains, rounds, rate, timeout, qtype):
+    return await asyncio.gather(*(_benchmark_server(server, port, domains, rounds, rate, timeout, qtype) for server in servers))
+
+class LatencyHistogram:
+    SUB_BUCKETS = 16
+    OCTAVES = 27
+
+    def __init__(self):
+        self.counts = array('L', bytes(array('L').itemsize * self.SUB_BUCKETS * self.OCTAVES))
+        self.total = 0
+        self.max_value = 0
+
+    def _index(self, value_us):
+        value_us = max(int(value_us), 1)
+        octave = value_us.bit_length() - 1
+        if octave < 4:
+            return value_us
+        sub = (value_us >> (octave - 4)) - self.SUB_BUCKETS
+        return min((octave - 3) * self.SUB_BUCKETS + sub, len(self.counts) - 1)
+
+    def _upper_bound(self, index):
+        if index < self.SUB_BUCKETS:
+            return index
+        octave = index // self.SUB_BUCKETS + 3
+        sub = index % self.SUB_BUCKETS
+        return ((self.SUB_BUCKETS + sub + 1) << (octave - 4)) - 1
+
+    def record(self, seconds):
+        value_us = seconds * 1e6
+        self.counts[self._index(value_us)] += 1
+        self.total += 1
+        self.max_value = max(self.max_value, int(value_us))
+
+    def merge(self, other):
+        for i, count in enumerate(other.counts):
+            if count:
+                self.counts[i] += count
+        self.total += other.total
+        self.max_value = max(self.max_value, other.max_value)
+
+    def percentile(self, p):
+        if not self.total:
+            return None
+        target = max(int(self.total * p / 100 + 0.5), 1)
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._upper_bound(i), self.max_value) / 1000
+        return self.max_value / 1000
+
+    def reset(self):
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.total = 0
+        self.max_value = 0
+
+    def to_sparse(self):
+        return [[i, count] for i, count in enumerate(self.counts) if count]
+
+    @classmethod
+    def from_sparse(cls, pairs):
+        histogram = cls()
+        for i, count in pairs:
+            histogram.counts[i] = count
+            histogram.total += count
+            histogram.max_value = max(histogram.max_value, histogram._upper_bound(i))
+        return histogram
+
+def _icmp_checksum(data):
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack("!%dH" % (len(data) // 2), data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+def icmp_available():
+    try:
+        socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP).close()
+        return True
+    except (OSError, AttributeError):
+        return False
+
+def _icmp_echo(address, sequence, timeout):
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP) as sock:
+        sock.settimeout(timeout)
+        sock.connect((address, 0))
+        payload = b"TerminalTec" + bytes(21)
+        header = struct.pack("!BBHHH", 8, 0, 0, 0, sequence)
+        packet = struct.pack("!BBHHH", 8, 0, _icmp_checksum(header + payload), 0, sequence) + payload
+        deadline = time.perf_counter() + timeout
+        start = time.perf_counter()
+        sock.send(packet)
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise socket.timeout()
+            sock.settimeout(remaining)
+            reply = sock.recv(1024)
+            if len(reply) >= 8 and reply[0] == 0 and struct.unpack("!H", reply[6:8])[0] == sequence:
+                return time.perf_counter() - start
+
+def _tcp_connect_time(address, port, timeout):
+    start = time.perf_counter()
+    with socket.create_connection((address, port), timeout=timeout):
+        return time.perf_counter() - start
+
+def summarize_probe_rtts(rtts, sent):
+    received = [rtt * 1000 for rtt in rtts if rtt is not None]
+    return {
+        'sent': sent,
+        'received': len(received),
+        'loss': (sent - len(received)) / sent * 100 if sent else 0.0,
+        'min': min(received) if received else None,
+        'avg': sum(received) / len(received) if received else None,
+        'max': max(received) if received else None,
+        'stddev': statistics.pstdev(received) if len(received) > 1 else 0.0 if received else None
+    }
+
+def summarize_dns_latencies(responses):
+    rtts = [r['rtt'] * 1000 for r in responses if r is not None and r['rcode'] in (0, 3)]
+    failures = sum(1 for r in responses if r is not None and r['rcode'] not in (0, 3))
+    lost = sum(1 for r in responses if r is None)
+    ordered = sorted(rtts)
+    jitter = sum(abs(b - a) for a, b in zip(rtts, rtts[1:])) / (len(rtts) - 1) if len(rtts) > 1 else 0.0
+    return {
+        'sent': len(responses),
+        'received': len(rtts),
+        'failures': failures,
+        'loss': lost / len(responses) * 100 if responses else 0.0,
+        'min': ordered[0] if ordered else None,
+        'p50': _latency_percentile(ordered, 50),
+        'p95': _latency_percentile(ordered, 95),
+        'p99': _latency_percentile(ordered, 99),
+        'max': ordered[-1] if ordered else None,
+        'jitter': jitter
+    }
+
+class DNSChecker:
+    def __init__(self, dns_servers=None, test_domains=None, dns_port=DNS_PORT):
+        self.dns_servers = list(dns_servers) if dns_servers else [
             "8.8.8.8",
             "8.8.4.4",
             "1.1.1.1",
@@ -15,13 +367,25 @@ class DNSChecker:
             "208.67.222.222",
             "208.67.220.220"
         ]
-        self.test_domains = [
+        self.test_domains = list(test_domains) if test_domains else [
             "google.com",
             "facebook.com",
             "youtube.com",
             "amazon.com",
             "microsoft.com"
         ]
+        self.dns_port = dns_port
+        self.query_timeout = 2.0
+        self.query_retries = 1
+        self.benchmark_results = {}
+        self.cache_analysis = {}
+        self.http_test_urls = [
+            ("HTTPS", "https://www.google.com/generate_204"),
+            ("HTTP", "http://example.com"),
+        ]
+        self.http_results = []
+        self.probe_targets = [("8.8.8.8", 53), ("1.1.1.1", 443), ("google.com", 443)]
+        self.connectivity_results = []
 
     def check_dns_resolution(self, domain):
         try:
@@ -35,66 +399,313 @@ class DNSChecker:
         total_time = 0.0
 
         for domain in self.test_domains:
-            start_time = time.time()
-            success, _ip = self._resolve_with_server(dns_server, domain)
-            end_time = time.time()
-            if success:
+            response = dns_query(dns_server, domain, timeout=self.query_timeout, retries=self.query_retries, port=self.dns_port)
+            if response is not None and response['rcode'] == 0 and response['addresses']:
                 success_count += 1
-                total_time += (end_time - start_time)
+                total_time += response['rtt']
 
         success_rate = (success_count / len(self.test_domains)) * 100
         avg_time = (total_time / success_count) if success_count > 0 else 0
         return success_rate, avg_time
 
-    def _resolve_with_server(self, server: str, domain: str):
-        if get_os_type() == "windows":
-            # Preferir PowerShell Resolve-DnsName
-            ps_cmd = (
-                'powershell -NoProfile -ExecutionPolicy Bypass '
-                f'"Resolve-DnsName -Server {server} -Name {domain} -Type A -NoHostsFile -ErrorAction SilentlyContinue | '
-                'Select-Object -First 1 IPAddress | Format-Table -HideTableHeaders"'
-            )
-            ok, out, err = run_command(ps_cmd)
-            if ok and out and out.strip() and not out.lower().startswith("resolve-dnsname"):
-                ip = out.strip().split()[0]
-                return True, ip
-            # Fallback: nslookup
-            ok, out, err = run_command(f"nslookup {domain} {server}")
-            if ok and "Address:" in out:
-                lines = [ln for ln in out.splitlines() if "Address:" in ln]
-                if lines:
-                    ip = lines[-1].split("Address:")[-1].strip()
-                    return True, ip
-            return False, None
-        else:
-            # Linux: dig preferencialmente
-            if shutil.which("dig"):
-                ok, out, err = run_command(f"dig +time=2 +tries=1 @{server} {domain} A +short")
-                if ok and out and out.strip():
-                    ip = out.strip().splitlines()[0].strip()
-                    return True, ip
-            # Fallback: nslookup
-            ok, out, err = run_command(f"nslookup {domain} {server}")
-            if ok and "Address:" in out:
-                lines = [ln for ln in out.splitlines() if "Address:" in ln]
-                if lines:
-                    ip = lines[-1].split("Address:")[-1].strip()
-                    return True, ip
+    def _resolve_with_server(self, server: str, domain: str, qtype: str = "A"):
+        response = dns_query(server, domain, qtype, timeout=self.query_timeout, retries=self.query_retries, port=self.dns_port)
+        if response is None or response['rcode'] != 0 or not response['addresses']:
             return False, None
+        return True, response['addresses'][0]
 
-    def measure_dns_latency(self, server: str, tries: int = 3, domain: str = "google.com"):
+    def measure_dns_latency(self, server: str, tries: int = 3, domain: str = None):
+        domain = domain or self.test_domains[0]
         success = 0
         total = 0.0
         for _ in range(tries):
-            t0 = time.perf_counter()
-            ok, _ = self._resolve_with_server(server, domain)
-            t1 = time.perf_counter()
-            if ok:
+            response = dns_query(server, domain, timeout=self.query_timeout, retries=0, port=self.dns_port)
+            if response is not None and response['rcode'] == 0:
                 success += 1
-                total += (t1 - t0)
+                total += response['rtt']
         avg_ms = (total / success) * 1000 if success else 0.0
         return success, avg_ms
 
+    def benchmark_dns_servers(self, servers=None, domains=None, rounds=3, rate=50, timeout=None, qtype="A", port=None):
+        servers = servers or self.dns_servers
+        port = port or self.dns_port
+        domains = domains or self.test_domains
+        timeout = timeout or self.query_timeout
+
+        start = time.perf_counter()
+        raw = asyncio.run(_benchmark_all(servers, port, domains, rounds, rate, timeout, qtype))
+        elapsed = time.perf_counter() - start
+
+        results = []
+        for server, responses in raw:
+            stats = summarize_dns_latencies(responses)
+            stats['server'] = server
+            results.append(stats)
+        results.sort(key=lambda r: (r['loss'] + r['failures'] * 100 / max(r['sent'], 1), r['p50'] if r['p50'] is not None else float('inf'), r['p99'] or 0.0))
+        self.benchmark_results = {'results': results, 'elapsed': elapsed, 'queries': sum(r['sent'] for r in results)}
+        return self.benchmark_results
+
+    def report_dns_benchmark(self, benchmark):
+        def ms(value):
+            return f"{value:.2f}" if value is not None else "N/A"
+
+        rows = []
+        for i, r in enumerate(benchmark['results'], 1):
+            rows.append([i, r['server'], ms(r['p50']), ms(r['p95']), ms(r['p99']), ms(r['jitter']), f"{r['loss']:.1f}%", r['failures']])
+        print(create_table(["#", "Servidor", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Jitter (ms)", "Perda", "Falhas"], rows))
+        print_info(f"{benchmark['queries']} consultas em {benchmark['elapsed']:.2f}s")
+
+        ranked = [r for r in benchmark['results'] if r['p50'] is not None]
+        if ranked:
+            print_success(f"Servidor mais rápido: {ranked[0]['server']} (p50 {ranked[0]['p50']:.2f}ms)")
+        for r in benchmark['results']:
+            if r['loss'] >= 10:
+                print_warning(f"{r['server']}: {r['loss']:.0f}% das consultas sem resposta")
+            elif r['p99'] is not None and r['p50'] and r['p99'] > r['p50'] * 5:
+                print_warning(f"{r['server']}: latência instável (p99 {r['p99']:.1f}ms vs p50 {r['p50']:.1f}ms)")
+
+    def get_system_dns_servers(self):
+        servers = []
+        if get_os_type() == "windows":
+            ok, out, err = run_command('powershell -NoProfile "Get-DnsClientServerAddress -AddressFamily IPv4 | Select-Object -ExpandProperty ServerAddresses"')
+            if ok:
+                servers = [line.strip() for line in out.splitlines() if line.strip()]
+        else:
+            try:
+                with open("/etc/resolv.conf") as f:
+                    for line in f:
+                        fields = line.split()
+                        if len(fields) >= 2 and fields[0] == "nameserver":
+                            servers.append(fields[1].split("%")[0])
+            except OSError:
+                pass
+        return list(dict.fromkeys(servers))
+
+    def _time_system_lookup(self, name):
+        start = time.perf_counter()
+        try:
+            socket.getaddrinfo(name, None, socket.AF_INET, socket.SOCK_STREAM)
+            found = True
+        except socket.gaierror:
+            found = False
+        return time.perf_counter() - start, found
+
+    def _default_upstream(self):
+        for server in self.get_system_dns_servers():
+            if not server.startswith("127.") and server != "::1":
+                return server
+        return self.dns_servers[0]
+
+    def analyze_resolver_cache(self, domains=None, upstream=None, flush=False, warm_repeats=3):
+        domains = domains or self.test_domains
+        upstream = upstream or self._default_upstream()
+        if flush and not self.flush_dns_cache():
+            print_warning("Não foi possível limpar o cache; usando subdomínios aleatórios")
+            flush = False
+
+        probes = [(domain, domain if flush else f"tt{random.getrandbits(32):08x}.{domain}") for domain in domains]
+        if not flush:
+            probes += [(domain, domain) for domain in domains]
+
+        results = []
+        for domain, name in probes:
+            cold, found = self._time_system_lookup(name)
+            warm = sorted(self._time_system_lookup(name)[0] for _ in range(warm_repeats))[warm_repeats // 2]
+
+            direct = [dns_query(upstream, name, timeout=self.query_timeout, retries=0, port=self.dns_port) for _ in range(warm_repeats)]
+            direct_rtts = sorted(r['rtt'] for r in direct if r is not None)
+            upstream_rtt = direct_rtts[len(direct_rtts) // 2] if direct_rtts else None
+
+            baseline = cold if flush or name != domain else upstream_rtt
+            results.append({
+                'domain': domain,
+                'name': name,
+                'found': found,
+                'baseline': "frio" if flush or name != domain else "upstream",
+                'cold': cold,
+                'warm': warm,
+                'upstream': upstream_rtt,
+                'speedup': baseline / warm if baseline is not None and warm > 0 else None,
+                'penalty': upstream_rtt - warm if upstream_rtt is not None else None
+            })
+        self.cache_analysis = {'upstream': upstream, 'flush': flush, 'results': results}
+        return self.cache_analysis
+
+    def report_resolver_cache(self, analysis):
+        def ms(value):
+            return f"{value * 1000:.2f}" if value is not None else "N/A"
+
+        rows = []
+        for r in analysis['results']:
+            rows.append([
+                r['domain'],
+                ("Positivo" if r['found'] else "Negativo (NXDOMAIN)") + (" vs upstream" if r['baseline'] == "upstream" else ""),
+                ms(r['cold']),
+                ms(r['warm']),
+                ms(r['upstream']),
+                f"{r['speedup']:.1f}x" if r['speedup'] is not None else "N/A",
+                ms(r['penalty'])
+            ])
+        method = "cache limpo" if analysis['flush'] else "subdomínios aleatórios e nomes reais"
+        print_info(f"Cache do resolvedor local vs upstream direto {analysis['upstream']} ({method}):")
+        print(create_table(["Domínio", "Cache", "Frio (ms)", "Quente (ms)", "Upstream (ms)", "Ganho do cache", "Penalidade upstream (ms)"], rows))
+        if not analysis['flush']:
+            print_info("Sem limpar o cache, o ganho dos nomes reais compara a consulta quente com o upstream direto")
+
+        def median_speedup(found):
+            speedups = sorted(r['speedup'] for r in analysis['results']
+                              if r['found'] == found and r['speedup'] is not None and (found or r['baseline'] == "frio"))
+            return speedups[len(speedups) // 2] if speedups else None
+
+        positive = median_speedup(True)
+        negative = median_speedup(False)
+        if positive is None and negative is None:
+            return False
+
+        if positive is not None:
+            if positive >= 2:
+                print_success(f"Cache local de DNS funcionando (respostas em cache {positive:.1f}x mais rápidas)")
+            else:
+                print_warning(f"Cache local de DNS pouco efetivo (ganho mediano {positive:.1f}x)")
+                if get_os_type() != "windows":
+                    print_info("Verifique se systemd-resolved ou nscd estão ativos: resolvectl status")
+
+        if negative is not None:
+            if negative >= 2:
+                print_success(f"Cache negativo (NXDOMAIN) funcionando (respostas em cache {negative:.1f}x mais rápidas)")
+            else:
+                print_info(f"Respostas NXDOMAIN não são mantidas em cache (ganho mediano {negative:.1f}x); isso não indica problema no cache de nomes válidos")
+        return True
+
+    def _dns_history_path(self):
+        return os.path.join(get_data_directory(), "dns_history.jsonl")
+
+    def _flush_dns_minute(self, minute, histograms, lost, history_path, p99_alert_ms, loss_alert):
+        rows = []
+        alerts = []
+        lines = []
+        for server, histogram in histograms.items():
+            sent = histogram.total + lost[server]
+            if not sent:
+                continue
+            lines.append(json.dumps({'t': minute, 's': server, 'l': lost[server], 'h': histogram.to_sparse()}, separators=(",", ":")) + "\n")
+            p50 = histogram.percentile(50)
+            p99 = histogram.percentile(99)
+            loss = lost[server] / sent * 100
+            rows.append([server, sent, f"{p50:.2f}" if p50 is not None else "N/A", f"{p99:.2f}" if p99 is not None else "N/A", f"{loss:.1f}%"])
+            if loss >= loss_alert:
+                alerts.append(f"{server}: {loss:.0f}% de timeouts no último minuto")
+            if p99 is not None and p99 >= p99_alert_ms:
+                alerts.append(f"{server}: p99 de {p99:.0f}ms no último minuto")
+            histogram.reset()
+            lost[server] = 0
+
+        try:
+            with open(history_path, "a") as f:
+                f.writelines(lines)
+        except OSError as e:
+            print_warning(f"Não foi possível gravar o histórico de DNS: {e}")
+
+        print_info(time.strftime("Minuto %H:%M", time.localtime(minute)))
+        print(create_table(["Servidor", "Consultas", "p50 (ms)", "p99 (ms)", "Timeouts"], rows))
+        for alert in alerts:
+            print_warning(alert)
+        return alerts
+
+    async def _monitor_dns_loop(self, state, servers, domains, interval, duration, flush):
+        loop = asyncio.get_running_loop()
+        endpoints = {}
+        for server in servers:
+            family = socket.AF_INET6 if ":" in server else socket.AF_INET
+            try:
+                endpoints[server] = await loop.create_datagram_endpoint(_DNSDatagramProtocol, remote_addr=(server, self.dns_port), family=family)
+            except OSError as e:
+                print_warning(f"{server}: {e}")
+
+        def record(server, task):
+            response = None if task.cancelled() else task.result()
+            if response is None:
+                state['lost'][server] += 1
+            else:
+                state['histograms'][server].record(response['rtt'])
+
+        pending = set()
+        try:
+            start = time.perf_counter()
+            tick = 0
+            while duration is None or tick * interval < duration:
+                delay = start + tick * interval - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                now_minute = int(time.time() // 60 * 60)
+                if now_minute != state['minute']:
+                    flush(state['minute'])
+                    state['minute'] = now_minute
+
+                domain = domains[tick % len(domains)]
+                tick += 1
+                for server in servers:
+                    if server not in endpoints:
+                        state['lost'][server] += 1
+                        continue
+                    transport, protocol = endpoints[server]
+                    task = loop.create_task(_async_dns_query(transport, protocol, domain, "A", self.query_timeout))
+                    task.add_done_callback(lambda t, server=server: record(server, t))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.wait(list(pending))
+        finally:
+            for transport, _protocol in endpoints.values():
+                transport.close()
+
+    def monitor_dns(self, duration=None, interval=1.0, servers=None, domains=None, p99_alert_ms=200.0, loss_alert=5.0, history_path=None):
+        servers = list(dict.fromkeys((servers or self.dns_servers) + self.get_system_dns_servers()))
+        domains = domains or self.test_domains
+        history_path = history_path or self._dns_history_path()
+
+        print_header("MONITORAMENTO CONTÍNUO DE DNS")
+        print_info(f"Servidores: {', '.join(servers)}")
+        print_info(f"Histórico: {history_path}")
+        print_info("Pressione Ctrl+C para parar")
+
+        state = {
+            'histograms': {server: LatencyHistogram() for server in servers},
+            'lost': {server: 0 for server in servers},
+            'minute': int(time.time() // 60 * 60)
+        }
+        totals = {server: LatencyHistogram() for server in servers}
+        alerts = []
+
+        def flush(minute):
+            for server in servers:
+                totals[server].merge(state['histograms'][server])
+            alerts.extend(self._flush_dns_minute(minute, state['histograms'], state['lost'], history_path, p99_alert_ms, loss_alert))
+
+        try:
+            asyncio.run(self._monitor_dns_loop(state, servers, domains, interval, duration, flush))
+        except KeyboardInterrupt:
+            print()
+            print_info("Monitoramento interrompido pelo usuário")
+
+        if any(state['histograms'][server].total or state['lost'][server] for server in servers):
+            flush(state['minute'])
+
+        rows = []
+        for server in servers:
+            histogram = totals[server]
+            if histogram.total:
+                rows.append([server, histogram.total, f"{histogram.percentile(50):.2f}", f"{histogram.percentile(99):.2f}", f"{histogram.percentile(99.9):.2f}"])
+        if rows:
+            print_info("Resumo do período:")
+            print(create_table(["Servidor", "Respostas", "p50 (ms)", "p99 (ms)", "p99.9 (ms)"], rows))
+        if alerts:
+            print_warning(f"{len(alerts)} alerta(s) durante o monitoramento")
+        else:
+            print_success("Nenhuma anomalia de DNS detectada")
+        return alerts
+
     def flush_dns_cache(self):
         if get_os_type() == "windows":
             success, output, error = run_command("ipconfig /flushdns")
@@ -136,18 +747,8 @@ class DNSChecker:
             print_error("Falha na conectividade básica")
             return False
 
-        print_info("Testando servidores DNS públicos...")
-        dns_results = []
-        for dns_server in self.dns_servers:
-            success_rate, avg_time = self.test_dns_server(dns_server)
-            dns_results.append([dns_server, f"{success_rate:.1f}%", f"{avg_time*1000:.1f}ms"])
-            print_info(f"DNS {dns_server}: {success_rate:.1f}% sucesso, {avg_time*1000:.1f}ms média")
-
-        print_info("\nLatência por servidor DNS (3 tentativas em google.com):")
-        for dns_server in self.dns_servers:
-            ok_count, avg_ms = self.measure_dns_latency(dns_server, tries=3)
-            status = "OK" if ok_count == 3 else f"{ok_count}/3"
-            print_info(f"DNS {dns_server}: {status}, ~{avg_ms:.1f}ms")
+        print_info("Testando servidores DNS públicos (consultas concorrentes)...")
+        self.report_dns_benchmark(self.benchmark_dns_servers())
 
         print_info("Verificando servidores DNS atuais...")
         success, output = self.get_current_dns_servers()
@@ -165,6 +766,7 @@ class DNSChecker:
                 print_error(f"Falha ao resolver {domain}")
 
         self._http_connectivity_tests()
+        self._print_summary()
         self._suggest_dns_change()
 
         return True
@@ -210,36 +812,189 @@ class DNSChecker:
         except Exception as e:
             print_warning(f"Falha ao obter visão geral de rede: {e}")
 
+    def _send_probe(self, address, port, method, sequence, send_at, deadline):
+        delay = send_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return None
+        try:
+            if method == "icmp":
+                return _icmp_echo(address, sequence, remaining)
+            return _tcp_connect_time(address, port, remaining)
+        except (socket.timeout, OSError):
+            return None
+
+    def _probe_target(self, host, port, method, count, timeout, interval):
+        result = {'host': host, 'port': port, 'method': method, 'error': None}
+        try:
+            family = socket.AF_INET if method == "icmp" else 0
+            address = socket.getaddrinfo(host, port or None, family, socket.SOCK_STREAM)[0][4][0]
+            result['address'] = address
+            start = time.perf_counter()
+            deadline = start + timeout
+            stagger = min(interval, timeout / (2 * count))
+            with ThreadPoolExecutor(max_workers=count) as executor:
+                futures = [
+                    executor.submit(self._send_probe, address, port, method, sequence, start + (sequence - 1) * stagger, deadline)
+                    for sequence in range(1, count + 1)
+                ]
+                rtts = [f.result() for f in futures]
+        except OSError as e:
+            result['error'] = str(e)
+            rtts = [None] * count
+        result.update(summarize_probe_rtts(rtts, count))
+        return result
+
+    def probe_connectivity(self, targets=None, count=4, timeout=2.0, interval=0.2, max_workers=32, use_icmp=None):
+        targets = targets or self.probe_targets
+        if use_icmp is None:
+            use_icmp = icmp_available()
+
+        jobs = [(host, port, "tcp") for host, port in targets if port]
+        if use_icmp:
+            jobs.extend((host, None, "icmp") for host in dict.fromkeys(host for host, _port in targets))
+
+        with ThreadPoolExecutor(max_workers=max(min(max_workers, len(jobs)), 1)) as executor:
+            results = list(executor.map(lambda job: self._probe_target(job[0], job[1], job[2], count, timeout, interval), jobs))
+        self.connectivity_results = results
+        return results
+
     def _test_connectivity(self):
         try:
             print_info("Testando conectividade básica:")
-            if get_os_type() == "windows":
-                run_command("ping -n 1 8.8.8.8")
-                run_command("ping -n 1 google.com")
-                run_command('powershell -NoProfile "Test-NetConnection -ComputerName 8.8.8.8 -Port 53"')
-            else:
-                run_command("ping -c 1 8.8.8.8")
-                run_command("ping -c 1 google.com")
-                # UDP 53 nem sempre testável sem ferramentas adicionais; rely em dig/nslookup
+            use_icmp = icmp_available()
+            results = self.probe_connectivity(use_icmp=use_icmp)
+            if not use_icmp:
+                print_info("ICMP sem privilégios indisponível (net.ipv4.ping_group_range); usando apenas TCP")
+
+            def ms(value):
+                return f"{value:.2f}" if value is not None else "-"
+
+            rows = []
+            for r in results:
+                target = f"{r['host']}:{r['port']}" if r['port'] else r['host']
+                rows.append([target, r['method'].upper(), f"{r['received']}/{r['sent']}", ms(r['min']), ms(r['avg']), ms(r['max']), ms(r['stddev']), f"{r['loss']:.0f}%"])
+            print(create_table(["Destino", "Método", "Respostas", "Mín (ms)", "Méd (ms)", "Máx (ms)", "Desvio (ms)", "Perda"], rows))
+
+            for r in results:
+                if r['error']:
+                    print_error(f"{r['host']}: {r['error']}")
+                elif r['loss'] == 100:
+                    print_error(f"{r['host']} inacessível via {r['method'].upper()}")
+                elif r['loss'] > 0:
+                    print_warning(f"{r['host']}: {r['loss']:.0f}% de perda via {r['method'].upper()}")
         except Exception as e:
             print_warning(f"Falha no teste de conectividade: {e}")
 
-    def _http_connectivity_tests(self):
+    def _print_summary(self):
+        print_info("\nResumo do diagnóstico:")
+        rows = []
+        reachable = [r for r in self.connectivity_results if r['received']]
+        latencies = [r['avg'] for r in reachable if r['avg'] is not None]
+        if self.connectivity_results:
+            rows.append(["Conectividade", f"{len(reachable)}/{len(self.connectivity_results)} destinos acessíveis"])
+            if latencies:
+                rows.append(["Latência de rede (mediana)", f"{sorted(latencies)[len(latencies) // 2]:.1f}ms"])
+        ranked = [r for r in self.benchmark_results.get('results', []) if r['p50'] is not None]
+        if ranked:
+            rows.append(["DNS mais rápido", f"{ranked[0]['server']} (p50 {ranked[0]['p50']:.1f}ms)"])
+            if latencies and ranked[0]['p50'] > max(sorted(latencies)[len(latencies) // 2] * 3, 50):
+                rows.append(["Observação", "DNS lento em relação à latência da rede"])
+        http_ok = [r for r in self.http_results if not r['error']]
+        if self.http_results:
+            rows.append(["HTTP/HTTPS", f"{len(http_ok)}/{len(self.http_results)} URLs OK"])
+        if rows:
+            print(create_table(["Item", "Resultado"], rows))
+
+    def _time_http_phases(self, url, timeout=5.0):
+        parts = urllib.parse.urlsplit(url)
+        secure = parts.scheme == "https"
+        port = parts.port or (443 if secure else 80)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        start = time.perf_counter()
+        address = socket.getaddrinfo(parts.hostname, port, type=socket.SOCK_STREAM)[0][4]
+        dns_done = time.perf_counter()
+        sock = socket.create_connection(address[:2], timeout=timeout)
+        connect_done = time.perf_counter()
+        tls_done = connect_done
         try:
-            print_info("\nTeste de HTTP/HTTPS (camada de aplicação):")
-            tests = [
-                ("HTTPS", "https://www.google.com/generate_204"),
-                ("HTTP", "http://example.com"),
-            ]
-            for label, url in tests:
+            if secure:
+                sock = ssl.create_default_context().wrap_socket(sock, server_hostname=parts.hostname)
+                tls_done = time.perf_counter()
+            conn = http.client.HTTPConnection(parts.hostname, port, timeout=timeout)
+            conn.sock = sock
+            conn.request("GET", path, headers={'Host': parts.netloc, 'User-Agent': "TerminalTec", 'Connection': "close"})
+            response = conn.getresponse()
+            first_byte = time.perf_counter()
+            body = response.read()
+            end = time.perf_counter()
+        finally:
+            sock.close()
+
+        return {
+            'status': response.status,
+            'bytes': len(body),
+            'dns': dns_done - start,
+            'connect': connect_done - dns_done,
+            'tls': tls_done - connect_done if secure else None,
+            'ttfb': first_byte - tls_done,
+            'transfer': end - first_byte,
+            'total': end - start
+        }
+
+    def _time_http_session(self, url, repeats, timeout=5.0):
+        timings = []
+        with requests.Session() as session:
+            for _ in range(repeats):
                 t0 = time.perf_counter()
-                try:
-                    resp = requests.get(url, timeout=5)
-                    dt = (time.perf_counter() - t0) * 1000
-                    print_success(f"{label} OK ({resp.status_code}) em {dt:.0f}ms: {url}")
-                except Exception as e:
-                    dt = (time.perf_counter() - t0) * 1000
-                    print_error(f"{label} ERRO em {dt:.0f}ms: {url} ({e})")
+                response = session.get(url, timeout=timeout)
+                response.content
+                timings.append(time.perf_counter() - t0)
+        warm = sorted(timings[1:])
+        return timings[0], warm[len(warm) // 2] if warm else None
+
+    def _measure_http_url(self, label, url, repeats, timeout):
+        result = {'label': label, 'url': url, 'error': None}
+        try:
+            result.update(self._time_http_phases(url, timeout))
+            result['session_cold'], result['session_warm'] = self._time_http_session(url, repeats, timeout)
+        except Exception as e:
+            result['error'] = str(e)
+        return result
+
+    def measure_http_timings(self, urls=None, repeats=5, timeout=5.0, max_workers=8):
+        urls = urls or self.http_test_urls
+        urls = [(u, u) if isinstance(u, str) else u for u in urls]
+        with ThreadPoolExecutor(max_workers=max(min(max_workers, len(urls)), 1)) as executor:
+            results = list(executor.map(lambda u: self._measure_http_url(u[0], u[1], repeats, timeout), urls))
+        self.http_results = results
+        return results
+
+    def _http_connectivity_tests(self, urls=None):
+        try:
+            print_info("\nTeste de HTTP/HTTPS (camada de aplicação):")
+            results = self.measure_http_timings(urls)
+
+            def ms(value):
+                return f"{value * 1000:.1f}" if value is not None else "-"
+
+            rows = []
+            for r in results:
+                if r['error']:
+                    print_error(f"{r['label']} ERRO: {r['url']} ({r['error']})")
+                    continue
+                print_success(f"{r['label']} OK ({r['status']}) em {r['total'] * 1000:.0f}ms: {r['url']}")
+                rows.append([r['label'], ms(r['dns']), ms(r['connect']), ms(r['tls']), ms(r['ttfb']), ms(r['transfer']), ms(r['total']), ms(r['session_cold']), ms(r['session_warm'])])
+            if rows:
+                print(create_table(["", "DNS", "Conexão", "TLS", "TTFB", "Transferência", "Total (ms)", "Sessão fria", "Keep-alive"], rows))
+                for r in results:
+                    if not r['error'] and r['session_warm'] and r['session_cold'] > r['session_warm'] * 3:
+                        print_info(f"{r['label']}: reutilizar a conexão economiza {(r['session_cold'] - r['session_warm']) * 1000:.0f}ms por requisição")
         except Exception as e:
             print_warning(f"Falha no teste HTTP/HTTPS: {e}")
 
@@ -0,0 +1,167 @@
+import socket
+import struct
+import random
+import threading
+import time
+
+class FakeDNSServer:
+    def __init__(self, host="127.0.0.1", port=0, delay=0.0, jitter=0.0, loss=0.0, nxdomain=None, truncate=False, answer="127.0.0.1", seed=None):
+        self.host = host
+        self.port = port
+        self.delay = delay
+        self.jitter = jitter
+        self.loss = loss
+        self.nxdomain = set(d.lower().strip(".") for d in (nxdomain or []))
+        self.truncate = truncate
+        self.answer = answer
+        self.random = random.Random(seed)
+        self.stats = {'received': 0, 'answered': 0, 'dropped': 0, 'nxdomain': 0, 'truncated': 0, 'tcp': 0}
+        self._udp = None
+        self._tcp = None
+        self._threads = []
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def address(self):
+        return self.host, self.port
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _parse_question(self, data):
+        labels = []
+        offset = 12
+        while data[offset]:
+            length = data[offset]
+            labels.append(data[offset + 1:offset + 1 + length].decode("ascii", "replace"))
+            offset += 1 + length
+        qtype = struct.unpack("!H", data[offset + 1:offset + 3])[0]
+        return ".".join(labels).lower(), qtype, data[12:offset + 5]
+
+    def build_response(self, data, over_tcp=False):
+        try:
+            domain, qtype, question = self._parse_question(data)
+        except (IndexError, struct.error):
+            return None
+
+        flags = 0x8180
+        answers = []
+        if domain in self.nxdomain or any(domain.endswith("." + d) for d in self.nxdomain):
+            flags |= 3
+            self._count('nxdomain')
+        elif self.truncate and not over_tcp:
+            flags |= 0x0200
+            self._count('truncated')
+        elif qtype == 1:
+            answers.append(b"\xc0\x0c" + struct.pack("!HHIH", 1, 1, 300, 4) + socket.inet_aton(self.answer))
+        elif qtype == 28:
+            answers.append(b"\xc0\x0c" + struct.pack("!HHIH", 28, 1, 300, 16) + socket.inet_pton(socket.AF_INET6, "::1"))
+
+        header = data[:2] + struct.pack("!HHHHH", flags, 1, len(answers), 0, 0)
+        return header + question + b"".join(answers)
+
+    def _query_delay(self):
+        if self.jitter:
+            return max(self.delay + self.random.uniform(-self.jitter, self.jitter), 0.0)
+        return self.delay
+
+    def _serve_udp(self):
+        while not self._stop_event.is_set():
+            try:
+                data, addr = self._udp.recvfrom(4096)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self._count('received')
+            if self.loss and self.random.random() < self.loss:
+                self._count('dropped')
+                continue
+            response = self.build_response(data)
+            if response is None:
+                continue
+            delay = self._query_delay()
+            if delay:
+                timer = threading.Timer(delay, self._send_udp, (response, addr))
+                timer.daemon = True
+                timer.start()
+            else:
+                self._send_udp(response, addr)
+
+    def _send_udp(self, response, addr):
+        try:
+            self._udp.sendto(response, addr)
+            self._count('answered')
+        except OSError:
+            pass
+
+    def _handle_tcp(self, conn):
+        with conn:
+            try:
+                conn.settimeout(5.0)
+                length = struct.unpack("!H", conn.recv(2))[0]
+                data = b""
+                while len(data) < length:
+                    chunk = conn.recv(length - len(data))
+                    if not chunk:
+                        return
+                    data += chunk
+                self._count('tcp')
+                response = self.build_response(data, over_tcp=True)
+                if response is None:
+                    return
+                time.sleep(self._query_delay())
+                conn.sendall(struct.pack("!H", len(response)) + response)
+                self._count('answered')
+            except (OSError, struct.error):
+                pass
+
+    def _serve_tcp(self):
+        while not self._stop_event.is_set():
+            try:
+                conn, _addr = self._tcp.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            thread = threading.Thread(target=self._handle_tcp, args=(conn,), daemon=True)
+            thread.start()
+
+    def start(self):
+        self._stop_event.clear()
+        self._udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._udp.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        self._udp.bind((self.host, self.port))
+        self.port = self._udp.getsockname()[1]
+        self._udp.settimeout(0.2)
+
+        self._tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._tcp.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._tcp.bind((self.host, self.port))
+        self._tcp.listen(64)
+        self._tcp.settimeout(0.2)
+
+        self._threads = [
+            threading.Thread(target=self._serve_udp, daemon=True),
+            threading.Thread(target=self._serve_tcp, daemon=True)
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        for sock in (self._udp, self._tcp):
+            if sock is not None:
+                sock.close()
+        self._threads = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
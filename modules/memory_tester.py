@@ -1,8 +1,226 @@
 import os
+import sys
+import json
+import glob
+import mmap
+import ctypes
+import queue
+import random
+import itertools
 import subprocess
 import time
+import multiprocessing
 import psutil
-from .utils import print_header, print_success, print_error, print_info, print_warning, run_command, get_os_type, create_table, format_bytes
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from .utils import print_header, print_success, print_error, print_info, print_warning, run_command, get_os_type, create_table, format_bytes, is_admin, get_data_directory
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MEMORY_TEST_BLOCK = 1024 * 1024
+# Triad em NumPy são duas passadas (c*s -> a, a+b -> a): 2 + 3 vetores trafegados, não 3
+STREAM_BYTES_PER_ELEMENT = {'copy': 2, 'scale': 2, 'add': 3, 'triad': 5}
+WORD_MASK = (1 << 64) - 1
+
+def _word_block(word, block_size=MEMORY_TEST_BLOCK):
+    return word.to_bytes(8, 'little') * (block_size // 8)
+
+def _buffer_address(buffer):
+    try:
+        pointer = ctypes.c_char.from_buffer(buffer)
+        address = ctypes.addressof(pointer)
+        del pointer
+        return address
+    except (TypeError, ValueError):
+        return 0
+
+def _lock_buffer(address, size):
+    try:
+        if sys.platform.startswith("linux"):
+            libc = ctypes.CDLL(None, use_errno=True)
+            return libc.mlock(ctypes.c_void_p(address), ctypes.c_size_t(size)) == 0
+        if sys.platform == "win32":
+            return bool(ctypes.windll.kernel32.VirtualLock(ctypes.c_void_p(address), ctypes.c_size_t(size)))
+    except (OSError, AttributeError):
+        pass
+    return False
+
+def _physical_address(virtual_address):
+    try:
+        page_size = os.sysconf('SC_PAGE_SIZE')
+        with open("/proc/self/pagemap", "rb") as f:
+            f.seek((virtual_address // page_size) * 8)
+            entry = int.from_bytes(f.read(8), 'little')
+    except (OSError, ValueError, AttributeError):
+        return None
+    pfn = entry & ((1 << 55) - 1)
+    if not entry >> 63 or not pfn:
+        return None
+    return pfn * page_size + virtual_address % page_size
+
+def _find_mismatches(buffer, offset, expected, base_address, pattern_name, limit):
+    errors = []
+    actual = buffer[offset:offset + len(expected)]
+    for chunk in range(0, len(expected), 4096):
+        if actual[chunk:chunk + 4096] == expected[chunk:chunk + 4096]:
+            continue
+        for i in range(chunk, min(chunk + 4096, len(expected)), 8):
+            if actual[i:i + 8] != expected[i:i + 8]:
+                address = base_address + offset + i
+                errors.append({
+                    'pattern': pattern_name,
+                    'offset': offset + i,
+                    'address': address,
+                    'physical_address': _physical_address(address),
+                    'expected': expected[i:i + 8].hex(),
+                    'actual': actual[i:i + 8].hex()
+                })
+                if len(errors) >= limit:
+                    return errors
+    return errors
+
+def _random_blocks(seed, block_size=MEMORY_TEST_BLOCK):
+    rng = random.Random(seed)
+    while True:
+        yield rng.getrandbits(block_size * 8).to_bytes(block_size, 'little')
+
+def _memory_test_patterns(seed):
+    for bit in range(64):
+        yield "walking ones", lambda bit=bit: itertools.repeat(_word_block(1 << bit))
+    for bit in range(64):
+        yield "walking zeros", lambda bit=bit: itertools.repeat(_word_block(~(1 << bit) & WORD_MASK))
+    yield "checkerboard", lambda: itertools.repeat(_word_block(0x5555555555555555))
+    yield "checkerboard", lambda: itertools.repeat(_word_block(0xAAAAAAAAAAAAAAAA))
+    yield "moving inversions", None
+    yield "random", lambda: _random_blocks(seed)
+
+def _memory_test_worker(worker_id, size_bytes, seed, use_mlock, progress_queue, max_errors=100):
+    block = MEMORY_TEST_BLOCK
+    size_bytes = max(size_bytes - size_bytes % block, block)
+    buffer = mmap.mmap(-1, size_bytes)
+    view = memoryview(buffer)
+    base_address = _buffer_address(buffer)
+    locked = _lock_buffer(base_address, size_bytes) if use_mlock and base_address else False
+    offsets = range(0, size_bytes, block)
+    errors = []
+    processed = 0
+    start = time.perf_counter()
+
+    def fill(blocks, order=offsets):
+        for offset, data in zip(order, blocks):
+            view[offset:offset + block] = data
+        return size_bytes
+
+    def verify(blocks, name, order=offsets):
+        for offset, expected in zip(order, blocks):
+            if buffer[offset:offset + block] != expected and len(errors) < max_errors:
+                errors.extend(_find_mismatches(buffer, offset, expected, base_address, name, max_errors - len(errors)))
+        return size_bytes
+
+    worker_seed = (seed if seed is not None else 0) + worker_id
+    patterns = list(_memory_test_patterns(worker_seed))
+    for index, (name, make_blocks) in enumerate(patterns, 1):
+        if make_blocks is not None:
+            processed += fill(make_blocks())
+            processed += verify(make_blocks(), name)
+        else:
+            zeros = _word_block(0)
+            ones = _word_block(WORD_MASK)
+            processed += fill(itertools.repeat(zeros))
+            for offset in offsets:
+                if buffer[offset:offset + block] != zeros and len(errors) < max_errors:
+                    errors.extend(_find_mismatches(buffer, offset, zeros, base_address, name, max_errors - len(errors)))
+                view[offset:offset + block] = ones
+            for offset in reversed(offsets):
+                if buffer[offset:offset + block] != ones and len(errors) < max_errors:
+                    errors.extend(_find_mismatches(buffer, offset, ones, base_address, name, max_errors - len(errors)))
+                view[offset:offset + block] = zeros
+            processed += 4 * size_bytes
+        if progress_queue is not None:
+            progress_queue.put((worker_id, index, len(patterns), processed))
+
+    elapsed = time.perf_counter() - start
+    view.release()
+    buffer.close()
+    return {
+        'worker': worker_id,
+        'size': size_bytes,
+        'locked': locked,
+        'elapsed': elapsed,
+        'processed': processed,
+        'errors': errors
+    }
+
+def _stream_worker(array_bytes, repetitions=5, barrier=None):
+    timings = {}
+
+    def measure(kernel, func, arrays_touched):
+        runs = timings.setdefault(kernel, {'bytes': arrays_touched * array_bytes, 'runs': []})
+        for _ in range(repetitions):
+            if barrier is not None:
+                barrier.wait(60)
+            start = time.perf_counter()
+            func()
+            runs['runs'].append((start, time.perf_counter()))
+
+    if np is not None:
+        elements = array_bytes // 8
+        a = np.full(elements, 1.0)
+        b = np.full(elements, 2.0)
+        c = np.zeros(elements)
+        scalar = 3.0
+
+        def triad():
+            np.multiply(c, scalar, out=a)
+            np.add(a, b, out=a)
+
+        measure('copy', lambda: np.copyto(c, a), STREAM_BYTES_PER_ELEMENT['copy'])
+        measure('scale', lambda: np.multiply(c, scalar, out=b), STREAM_BYTES_PER_ELEMENT['scale'])
+        measure('add', lambda: np.add(a, b, out=c), STREAM_BYTES_PER_ELEMENT['add'])
+        measure('triad', triad, STREAM_BYTES_PER_ELEMENT['triad'])
+    else:
+        source = bytearray(b"\x01") * array_bytes
+        destination = bytearray(array_bytes)
+        source_view = memoryview(source)
+        destination_view = memoryview(destination)
+
+        def copy():
+            destination_view[:] = source_view
+
+        measure('copy', copy, STREAM_BYTES_PER_ELEMENT['copy'])
+    return timings
+
+def _stream_best_rate(per_worker, kernel):
+    results = [timings[kernel] for timings in per_worker if kernel in timings]
+    if not results:
+        return None
+    best = 0.0
+    for repetition in zip(*(result['runs'] for result in results)):
+        elapsed = max(end for _start, end in repetition) - min(start for start, _end in repetition)
+        if elapsed > 0:
+            best = max(best, sum(result['bytes'] for result in results) / elapsed)
+    return best
+
+def _pointer_chase_latency(size_bytes, steps=2000000, line_size=64):
+    stride = line_size // 8
+    lines = max(size_bytes // line_size, 2)
+    order = list(range(lines))
+    random.shuffle(order)
+    chain = array('q', bytes(8 * lines * stride))
+    for i in range(lines):
+        chain[order[i] * stride] = order[(i + 1) % lines] * stride
+
+    index = order[0] * stride
+    for _ in range(min(lines, steps)):
+        index = chain[index]
+    start = time.perf_counter()
+    for _ in range(steps):
+        index = chain[index]
+    elapsed = time.perf_counter() - start
+    return elapsed / steps * 1e9
 
 class MemoryTester:
     def __init__(self):
@@ -29,10 +247,7 @@ class MemoryTester:
         try:
             print_info("Verificando saúde da memória RAM...")
             
-            success, output, error = run_command("wmic memorychip get capacity,speed,manufacturer,partnumber /format:table")
-            if success:
-                print_info("Informações dos módulos de memória:")
-                print(output)
+            self.report_dimm_inventory(self.get_dimm_inventory())
             
             success, output, error = run_command("wmic memorychip get status /format:table")
             if success:
@@ -48,10 +263,7 @@ class MemoryTester:
         try:
             print_info("Verificando saúde da memória RAM...")
             
-            success, output, error = run_command("dmidecode -t memory")
-            if success:
-                print_info("Informações detalhadas da memória:")
-                print(output)
+            self.report_dimm_inventory(self.get_dimm_inventory())
             
             success, output, error = run_command("cat /proc/meminfo")
             if success:
@@ -108,6 +320,320 @@ class MemoryTester:
             print_error(f"Erro no teste memtester: {e}")
             return False
 
+    def run_native_memory_test(self, size_mb=256, workers=None, use_mlock=False, seed=None):
+        workers = workers or os.cpu_count() or 1
+        size_bytes = size_mb * 1024 * 1024
+        available = psutil.virtual_memory().available
+        if size_bytes > available * 0.8:
+            size_bytes = int(available * 0.8)
+            print_warning(f"Tamanho reduzido para {format_bytes(size_bytes)} para não esgotar a memória disponível")
+        per_worker = max(size_bytes // workers, MEMORY_TEST_BLOCK)
+        seed = seed if seed is not None else random.randrange(1 << 32)
+
+        print_info(f"Teste nativo de memória: {workers} processo(s) x {format_bytes(per_worker)} (semente {seed})")
+        if use_mlock and not is_admin():
+            print_warning("mlock pode falhar sem privilégios; as páginas podem ir para o swap durante o teste")
+
+        try:
+            manager = multiprocessing.Manager()
+            progress_queue = manager.Queue()
+            progress = {}
+            results = []
+            start = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(_memory_test_worker, worker_id, per_worker, seed, use_mlock, progress_queue)
+                    for worker_id in range(workers)
+                ]
+                while not all(f.done() for f in futures):
+                    try:
+                        worker_id, done, total, processed = progress_queue.get(timeout=0.5)
+                        progress[worker_id] = (done, total, processed)
+                    except queue.Empty:
+                        pass
+                    if progress:
+                        done = sum(p[0] for p in progress.values())
+                        total = max(p[1] for p in progress.values()) * workers
+                        processed = sum(p[2] for p in progress.values())
+                        elapsed = time.perf_counter() - start
+                        print(f"\rProgresso: {done / total * 100:5.1f}% | {format_bytes(processed / elapsed)}/s", end="", flush=True)
+                results = [f.result() for f in futures]
+            print()
+            manager.shutdown()
+        except Exception as e:
+            print()
+            print_error(f"Erro no teste nativo de memória: {e}")
+            return False
+
+        rows = []
+        all_errors = []
+        for result in results:
+            all_errors.extend(result['errors'])
+            rows.append([
+                result['worker'],
+                format_bytes(result['size']),
+                "Sim" if result['locked'] else "Não",
+                f"{result['elapsed']:.1f}s",
+                f"{format_bytes(result['processed'] / result['elapsed'])}/s" if result['elapsed'] else "N/A",
+                len(result['errors'])
+            ])
+        print(create_table(["Processo", "Tamanho", "mlock", "Tempo", "Throughput", "Erros"], rows))
+
+        self.test_results['native'] = results
+        if all_errors:
+            print_error(f"⚠ {len(all_errors)} divergência(s) de memória detectada(s)!")
+            error_rows = []
+            for error in all_errors[:20]:
+                physical = error['physical_address']
+                error_rows.append([
+                    error['pattern'],
+                    f"0x{error['address']:x}",
+                    f"0x{physical:x}" if physical is not None else "N/A",
+                    error['expected'],
+                    error['actual']
+                ])
+            print(create_table(["Padrão", "Endereço virtual", "Endereço físico", "Esperado", "Lido"], error_rows))
+            self.memory_errors.extend(
+                f"Divergência no padrão {e['pattern']} em 0x{e['address']:x}" for e in all_errors
+            )
+        else:
+            print_success("✓ Teste nativo de memória passou!")
+        return True
+
+    def _get_llc_size(self):
+        cache_dir = "/sys/devices/system/cpu/cpu0/cache"
+        largest = 0
+        try:
+            for entry in os.listdir(cache_dir):
+                if not entry.startswith("index"):
+                    continue
+                with open(os.path.join(cache_dir, entry, "size")) as f:
+                    text = f.read().strip()
+                multiplier = {'K': 1024, 'M': 1024 * 1024}.get(text[-1:], 1)
+                largest = max(largest, int(text.rstrip("KM")) * multiplier)
+        except (OSError, ValueError):
+            pass
+        return largest or 32 * 1024 * 1024
+
+    def _parse_memory_size(self, text):
+        fields = text.split()
+        if len(fields) < 2 or not fields[0].isdigit():
+            return None
+        multiplier = {'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3, 'TB': 1024 ** 4}.get(fields[1].upper())
+        return int(fields[0]) * multiplier if multiplier else None
+
+    def _parse_speed(self, text):
+        fields = text.split()
+        return int(fields[0]) if fields and fields[0].isdigit() else None
+
+    def parse_dmidecode_memory(self, output):
+        dimms = []
+        current = None
+        for line in output.splitlines():
+            stripped = line.strip()
+            if stripped == "Memory Device":
+                current = {}
+                dimms.append(current)
+                continue
+            if current is None or ":" not in stripped or not line.startswith("\t"):
+                if not stripped:
+                    current = None
+                continue
+            key, _, value = stripped.partition(":")
+            current[key.strip()] = value.strip()
+
+        records = []
+        for raw in dimms:
+            size = self._parse_memory_size(raw.get('Size', ''))
+            if not size:
+                continue
+            rank = raw.get('Rank', '')
+            records.append({
+                'slot': raw.get('Locator') or raw.get('Bank Locator') or "N/A",
+                'bank': raw.get('Bank Locator'),
+                'size': size,
+                'type': raw.get('Type'),
+                'speed': self._parse_speed(raw.get('Speed', '')),
+                'configured_speed': self._parse_speed(raw.get('Configured Memory Speed', raw.get('Configured Clock Speed', ''))),
+                'vendor': raw.get('Manufacturer'),
+                'part': (raw.get('Part Number') or '').strip() or None,
+                'rank': int(rank) if rank.isdigit() else None
+            })
+        return records
+
+    def parse_wmic_memorychip(self, output):
+        lines = [line.strip() for line in output.splitlines() if line.strip()]
+        if not lines:
+            return []
+        header = [h.strip() for h in lines[0].split(",")]
+        records = []
+        for line in lines[1:]:
+            row = dict(zip(header, (f.strip() for f in line.split(","))))
+            capacity = row.get('Capacity', '')
+            if not capacity.isdigit():
+                continue
+            speed = row.get('Speed', '')
+            configured = row.get('ConfiguredClockSpeed', '')
+            records.append({
+                'slot': row.get('DeviceLocator') or row.get('BankLabel') or "N/A",
+                'bank': row.get('BankLabel'),
+                'size': int(capacity),
+                'type': None,
+                'speed': int(speed) if speed.isdigit() else None,
+                'configured_speed': int(configured) if configured.isdigit() else None,
+                'vendor': row.get('Manufacturer') or None,
+                'part': row.get('PartNumber') or None,
+                'rank': None
+            })
+        return records
+
+    def _get_boot_id(self):
+        try:
+            with open("/proc/sys/kernel/random/boot_id") as f:
+                return f.read().strip()
+        except OSError:
+            return str(int(psutil.boot_time()))
+
+    def _dimm_cache_path(self):
+        return os.path.join(get_data_directory(), "dimm_inventory.json")
+
+    def get_dimm_inventory(self, refresh=False):
+        boot_id = self._get_boot_id()
+        if not refresh:
+            try:
+                with open(self._dimm_cache_path()) as f:
+                    cached = json.load(f)
+                if cached.get('boot_id') == boot_id:
+                    return cached.get('dimms', [])
+            except (OSError, ValueError):
+                pass
+
+        if get_os_type() == "windows":
+            success, output, error = run_command(
+                "wmic memorychip get BankLabel,Capacity,ConfiguredClockSpeed,DeviceLocator,Manufacturer,PartNumber,Speed /format:csv"
+            )
+            dimms = self.parse_wmic_memorychip(output) if success else []
+        else:
+            success, output, error = run_command("dmidecode -t memory")
+            dimms = self.parse_dmidecode_memory(output) if success else []
+
+        if dimms:
+            try:
+                with open(self._dimm_cache_path(), "w") as f:
+                    json.dump({'boot_id': boot_id, 'dimms': dimms}, f)
+            except OSError as e:
+                print_warning(f"Não foi possível salvar o inventário de memória: {e}")
+        return dimms
+
+    def report_dimm_inventory(self, dimms):
+        if not dimms:
+            print_warning("Inventário de módulos indisponível (requer privilégios de administrador)")
+            return False
+
+        rows = []
+        for d in dimms:
+            rows.append([
+                d['slot'],
+                format_bytes(d['size']),
+                d['type'] or "N/A",
+                f"{d['speed']} MT/s" if d['speed'] else "N/A",
+                f"{d['configured_speed']} MT/s" if d['configured_speed'] else "N/A",
+                d['vendor'] or "N/A",
+                d['part'] or "N/A",
+                d['rank'] if d['rank'] is not None else "N/A"
+            ])
+        print_info("Módulos de memória instalados:")
+        print(create_table(["Slot", "Tamanho", "Tipo", "Velocidade", "Configurada", "Fabricante", "Part Number", "Rank"], rows))
+
+        total = sum(d['size'] for d in dimms)
+        print_info(f"{len(dimms)} módulo(s), {format_bytes(total)} no total")
+
+        rated_speeds = {d['speed'] for d in dimms if d['speed']}
+        if len(rated_speeds) > 1:
+            print_warning(f"Módulos com velocidades diferentes ({', '.join(str(v) for v in sorted(rated_speeds))} MT/s) - todos operam na menor")
+        for d in dimms:
+            if d['speed'] and d['configured_speed'] and d['configured_speed'] < d['speed']:
+                print_warning(f"{d['slot']}: configurado a {d['configured_speed']} MT/s, abaixo dos {d['speed']} MT/s nominais")
+        if len({d['part'] for d in dimms}) > 1:
+            print_info("Módulos de modelos diferentes instalados - prefira pares idênticos para dual/quad channel")
+        return True
+
+    def run_memory_benchmark(self, workers=None, repetitions=5):
+        workers = workers or os.cpu_count() or 1
+        llc = self._get_llc_size()
+        available = psutil.virtual_memory().available
+        array_bytes = max(min(4 * llc, available // 6), 64 * 1024 * 1024)
+
+        print_header("Benchmark de Banda e Latência de Memória")
+        vectors = 3 if np is not None else 2
+        print_info(f"Cache de último nível: {format_bytes(llc)} | Vetores STREAM: {vectors} x {format_bytes(array_bytes)}")
+        if np is None:
+            print_warning("NumPy não instalado - apenas o kernel Copy será medido (pip install numpy para Scale/Add/Triad)")
+
+        try:
+            print_info("Executando STREAM em 1 processo...")
+            single_timings = _stream_worker(array_bytes, repetitions)
+            print_info(f"Executando STREAM em {workers} processos...")
+            with multiprocessing.Manager() as manager, ProcessPoolExecutor(max_workers=workers) as executor:
+                barrier = manager.Barrier(workers)
+                futures = [executor.submit(_stream_worker, array_bytes // workers, repetitions, barrier) for _ in range(workers)]
+                per_worker = [f.result() for f in futures]
+        except Exception as e:
+            print_error(f"Erro no benchmark STREAM: {e}")
+            return False
+
+        single = {kernel: _stream_best_rate([single_timings], kernel) for kernel in single_timings}
+        multi = {kernel: _stream_best_rate(per_worker, kernel) for kernel in single_timings}
+
+        rows = []
+        for kernel in ('copy', 'scale', 'add', 'triad'):
+            if kernel in single:
+                rows.append([
+                    kernel.capitalize(),
+                    f"{(single[kernel] or 0.0) / 1e9:.2f} GB/s",
+                    f"{(multi.get(kernel) or 0.0) / 1e9:.2f} GB/s"
+                ])
+        print(create_table(["Kernel", "1 processo", f"{workers} processos"], rows))
+
+        print_info("Latência por tamanho do conjunto de trabalho (pointer chasing):")
+        latency_rows = []
+        baseline = None
+        size = 16 * 1024
+        max_size = min(max(4 * llc, 64 * 1024 * 1024), available // 4)
+        latencies = []
+        while size <= max_size:
+            latency = _pointer_chase_latency(size)
+            baseline = latency if baseline is None else baseline
+            latencies.append((size, latency))
+            latency_rows.append([format_bytes(size), f"{latency:.1f} ns", f"{latency - baseline:+.1f} ns"])
+            size *= 4
+        print(create_table(["Conjunto", "ns/acesso", "Acima do L1"], latency_rows))
+        print_info("A coluna 'Acima do L1' desconta o custo fixo do interpretador medido no menor conjunto")
+
+        dimms = [d for d in self.get_dimm_inventory() if d['speed']]
+        best_rate = max((rate for rate in multi.values() if rate), default=0.0)
+        if dimms:
+            theoretical = sum((d['configured_speed'] or d['speed']) * 1e6 * 8 for d in dimms)
+            print_info(f"{len(dimms)} módulo(s) detectado(s); pico teórico (1 canal por módulo): {theoretical / 1e9:.1f} GB/s")
+            if theoretical and best_rate:
+                efficiency = best_rate / theoretical * 100
+                print_info(f"Banda medida: {best_rate / 1e9:.2f} GB/s ({efficiency:.0f}% do pico teórico)")
+                if efficiency < 30:
+                    print_warning("Banda muito abaixo do esperado - verifique se os módulos estão em canais distintos")
+            for d in dimms:
+                if d['configured_speed'] and d['configured_speed'] < d['speed']:
+                    print_warning(f"{d['slot']}: operando a {d['configured_speed']} MT/s, abaixo dos {d['speed']} MT/s nominais")
+        else:
+            print_info("Velocidade dos módulos indisponível (dmidecode ausente ou sem permissão)")
+
+        self.test_results['benchmark'] = {
+            'single': single,
+            'multi': multi,
+            'latency': latencies,
+            'workers': workers
+        }
+        return True
+
     def check_memory_errors_windows(self):
         try:
             print_info("Verificando erros de memória no Event Viewer...")
@@ -125,21 +651,158 @@ class MemoryTester:
             print_error(f"Erro ao verificar eventos: {e}")
             return False
 
+    def _read_sysfs_value(self, path):
+        try:
+            with open(path) as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def _read_sysfs_count(self, path):
+        value = self._read_sysfs_value(path)
+        return int(value) if value and value.isdigit() else 0
+
+    def get_edac_counters(self, base="/sys/devices/system/edac/mc"):
+        counters = {'controllers': {}, 'dimms': {}}
+        for mc_dir in sorted(glob.glob(os.path.join(base, "mc[0-9]*"))):
+            mc = os.path.basename(mc_dir)
+            counters['controllers'][mc] = {
+                'ce': self._read_sysfs_count(os.path.join(mc_dir, "ce_count")),
+                'ue': self._read_sysfs_count(os.path.join(mc_dir, "ue_count")),
+                'ce_noinfo': self._read_sysfs_count(os.path.join(mc_dir, "ce_noinfo_count")),
+                'ue_noinfo': self._read_sysfs_count(os.path.join(mc_dir, "ue_noinfo_count"))
+            }
+
+            for dimm_dir in sorted(glob.glob(os.path.join(mc_dir, "dimm[0-9]*")) + glob.glob(os.path.join(mc_dir, "rank[0-9]*"))):
+                key = f"{mc}/{os.path.basename(dimm_dir)}"
+                counters['dimms'][key] = {
+                    'label': self._read_sysfs_value(os.path.join(dimm_dir, "dimm_label")) or key,
+                    'ce': self._read_sysfs_count(os.path.join(dimm_dir, "dimm_ce_count")),
+                    'ue': self._read_sysfs_count(os.path.join(dimm_dir, "dimm_ue_count"))
+                }
+
+            if not any(key.startswith(mc + "/") for key in counters['dimms']):
+                for csrow_dir in sorted(glob.glob(os.path.join(mc_dir, "csrow[0-9]*"))):
+                    csrow_key = f"{mc}/{os.path.basename(csrow_dir)}"
+                    labels = []
+                    for channel_ce in sorted(glob.glob(os.path.join(csrow_dir, "ch[0-9]*_ce_count"))):
+                        channel = os.path.basename(channel_ce).split("_")[0]
+                        key = f"{csrow_key}/{channel}"
+                        label = self._read_sysfs_value(os.path.join(csrow_dir, f"{channel}_dimm_label")) or key
+                        labels.append(label)
+                        counters['dimms'][key] = {'label': label, 'ce': self._read_sysfs_count(channel_ce), 'ue': 0}
+                    if labels:
+                        counters['dimms'][csrow_key] = {
+                            'label': f"{csrow_key} ({' / '.join(labels)})",
+                            'ce': 0,
+                            'ue': self._read_sysfs_count(os.path.join(csrow_dir, "ue_count"))
+                        }
+        return counters
+
+    def _count_mcelog_events(self, path="/var/log/mcelog"):
+        try:
+            with open(path, errors="replace") as f:
+                return sum(1 for line in f if line.startswith("Hardware event"))
+        except OSError:
+            return None
+
+    def _memory_error_state_path(self):
+        return os.path.join(get_data_directory(), "memory_errors.json")
+
+    def _load_memory_error_state(self):
+        try:
+            with open(self._memory_error_state_path()) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_memory_error_state(self, state):
+        try:
+            with open(self._memory_error_state_path(), "w") as f:
+                json.dump(state, f)
+        except OSError as e:
+            print_warning(f"Não foi possível salvar o histórico de erros: {e}")
+
+    def _new_since(self, current, previous):
+        if previous is None:
+            return None
+        if current < previous:
+            return current
+        return current - previous
+
     def check_memory_errors_linux(self):
         try:
-            print_info("Verificando erros de memória no kernel...")
-            
-            success, output, error = run_command("dmesg | grep -i 'memory\|ram\|mem' | tail -10")
-            if success:
-                if output.strip():
-                    print_warning("Mensagens relacionadas à memória:")
-                    print(output)
-                else:
-                    print_success("✓ Nenhuma mensagem de erro de memória encontrada")
-            
+            print_info("Verificando contadores de erros de memória (EDAC/MCE)...")
+
+            counters = self.get_edac_counters()
+            mce_events = self._count_mcelog_events()
+            previous = self._load_memory_error_state()
+            previous_dimms = previous.get('dimms', {})
+            previous_controllers = previous.get('controllers', {})
+            baseline = not previous.get('timestamp')
+            if baseline:
+                print_info("Primeira verificação: os contadores atuais serão usados como referência")
+            else:
+                since = time.strftime('%Y-%m-%d %H:%M', time.localtime(previous['timestamp']))
+                print_info(f"Comparando com a última verificação ({since})")
+
+            found_new = False
+            if counters['controllers']:
+                rows = []
+                for key, dimm in counters['dimms'].items():
+                    old = previous_dimms.get(key, {})
+                    new_ce = self._new_since(dimm['ce'], old.get('ce'))
+                    new_ue = self._new_since(dimm['ue'], old.get('ue'))
+                    rows.append([dimm['label'], key, dimm['ce'], dimm['ue'], "-" if new_ce is None else new_ce, "-" if new_ue is None else new_ue])
+                    found_new = found_new or bool(new_ce or new_ue)
+                    if new_ce is None and (dimm['ce'] or dimm['ue']):
+                        print_warning(f"{dimm['label']}: {dimm['ce']} erro(s) corrigido(s) e {dimm['ue']} não corrigível(is) acumulados")
+                        self.memory_errors.append(f"Erros acumulados em {dimm['label']}")
+                    elif new_ue:
+                        print_error(f"⚠ {new_ue} erro(s) NÃO corrigível(is) novo(s) em {dimm['label']}")
+                        self.memory_errors.append(f"Erros não corrigíveis em {dimm['label']}")
+                    elif new_ce:
+                        print_warning(f"{new_ce} erro(s) corrigido(s) (ECC) novo(s) em {dimm['label']}")
+                        self.memory_errors.append(f"Erros corrigidos em {dimm['label']}")
+                if rows:
+                    print(create_table(["Módulo", "Localização", "CE total", "UE total", "CE novos", "UE novos"], rows))
+
+                for mc, values in counters['controllers'].items():
+                    old = previous_controllers.get(mc, {})
+                    unattributed = self._new_since(values['ce_noinfo'] + values['ue_noinfo'],
+                                                   old.get('ce_noinfo', 0) + old.get('ue_noinfo', 0) if old else None)
+                    if unattributed:
+                        print_warning(f"{mc}: {unattributed} erro(s) novo(s) sem módulo identificado")
+
+                if baseline:
+                    print_success("✓ Contadores registrados; a próxima verificação mostrará apenas erros novos")
+                elif not found_new:
+                    print_success("✓ Nenhum erro de memória novo desde a última verificação")
+            else:
+                print_info("EDAC não disponível (sem ECC ou driver EDAC não carregado)")
+
+            if mce_events is not None:
+                new_mce = self._new_since(mce_events, previous.get('mce_events'))
+                if new_mce is None and mce_events:
+                    print_info(f"{mce_events} evento(s) de machine check registrados em /var/log/mcelog")
+                elif new_mce:
+                    print_warning(f"{new_mce} evento(s) de machine check novo(s) em /var/log/mcelog")
+                    self.memory_errors.append("Eventos de machine check registrados")
+
+            success, output, error = run_command("dmesg | grep -E 'EDAC|\\[Hardware Error\\]|Machine check' | tail -10")
+            if success and output.strip():
+                print_warning("Mensagens do kernel sobre erros de hardware:")
+                print(output)
+
+            self._save_memory_error_state({
+                'timestamp': time.time(),
+                'controllers': counters['controllers'],
+                'dimms': counters['dimms'],
+                'mce_events': mce_events
+            })
             return True
         except Exception as e:
-            print_error(f"Erro ao verificar dmesg: {e}")
+            print_error(f"Erro ao verificar erros de memória: {e}")
             return False
 
     def analyze_memory_usage(self):
@@ -198,6 +861,16 @@ class MemoryTester:
         
         return True
 
+    def _prompt_native_memory_test(self):
+        size = input("Tamanho total do teste em MB (padrão: 1024): ").strip()
+        try:
+            size_mb = int(size) if size else 1024
+        except ValueError:
+            print_error("Valor inválido, usando 1024MB")
+            size_mb = 1024
+        use_mlock = input("Bloquear páginas na RAM com mlock? (s/n): ").strip().lower() == 's'
+        return self.run_native_memory_test(size_mb, use_mlock=use_mlock)
+
     def run_diagnostic(self):
         print_header("🧠 TESTE DE MEMÓRIA RAM")
         print_info("Esta ferramenta verifica:")
@@ -216,12 +889,18 @@ class MemoryTester:
             
             print_info("\nOpções de teste:")
             print_info("1. Executar Diagnóstico de Memória do Windows")
-            print_info("2. Pular teste (apenas análise)")
+            print_info("2. Executar teste nativo (multiprocesso)")
+            print_info("3. Benchmark de banda e latência")
+            print_info("4. Pular teste (apenas análise)")
             
-            choice = input("Escolha uma opção (1-2): ").strip()
+            choice = input("Escolha uma opção (1-4): ").strip()
             
             if choice == "1":
                 self.run_windows_memory_diagnostic()
+            elif choice == "2":
+                self._prompt_native_memory_test()
+            elif choice == "3":
+                self.run_memory_benchmark()
             
         else:
             self.check_memory_health_linux()
@@ -229,9 +908,11 @@ class MemoryTester:
             
             print_info("\nOpções de teste:")
             print_info("1. Executar memtester (teste básico)")
-            print_info("2. Pular teste (apenas análise)")
+            print_info("2. Executar teste nativo (multiprocesso)")
+            print_info("3. Benchmark de banda e latência")
+            print_info("4. Pular teste (apenas análise)")
             
-            choice = input("Escolha uma opção (1-2): ").strip()
+            choice = input("Escolha uma opção (1-4): ").strip()
             
             if choice == "1":
                 size = input("Tamanho do teste em MB (padrão: 100): ").strip()
@@ -241,6 +922,10 @@ class MemoryTester:
                 except ValueError:
                     print_error("Valor inválido, usando 100MB")
                     self.run_memtester_linux(100)
+            elif choice == "2":
+                self._prompt_native_memory_test()
+            elif choice == "3":
+                self.run_memory_benchmark()
         
         self.get_memory_recommendations()
         return True 
\ No newline at end of file
@@ -1,12 +1,140 @@
+import heapq
+import os
 import psutil
+import threading
 import time
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 from .utils import print_header, print_success, print_error, print_info, print_warning, format_bytes, format_percentage, create_table
 
+class MemorySampler:
+    FIELDS = ('timestamp', 'percent', 'used', 'available')
+
+    def __init__(self, interval=0.5, capacity=7200):
+        self.interval = interval
+        self.capacity = capacity
+        self._buffers = {field: array('d', bytes(8 * capacity)) for field in self.FIELDS}
+        self._index = 0
+        self._count = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.is_running():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval * 2)
+        self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.record(psutil.virtual_memory())
+            except Exception:
+                pass
+            self._stop_event.wait(self.interval)
+
+    def record(self, memory, timestamp=None):
+        with self._lock:
+            i = self._index
+            self._buffers['timestamp'][i] = timestamp if timestamp is not None else time.time()
+            self._buffers['percent'][i] = memory.percent
+            self._buffers['used'][i] = memory.used
+            self._buffers['available'][i] = memory.available
+            self._index = (i + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+    def __len__(self):
+        return self._count
+
+    def _ordered(self, field):
+        count = self._count
+        start = (self._index - count) % self.capacity
+        if start + count <= self.capacity:
+            return self._buffers[field][start:start + count]
+        return self._buffers[field][start:] + self._buffers[field][:self._index]
+
+    def values(self, field='percent', window=None):
+        with self._lock:
+            timestamps = self._ordered('timestamp')
+            data = self._ordered(field)
+
+        if window is not None and timestamps:
+            first = bisect_left(timestamps, timestamps[-1] - window)
+            timestamps = timestamps[first:]
+            data = data[first:]
+        return timestamps, data
+
+    def snapshot(self, window=None):
+        with self._lock:
+            columns = {field: self._ordered(field) for field in self.FIELDS}
+
+        timestamps = columns['timestamp']
+        if window is not None and timestamps:
+            first = bisect_left(timestamps, timestamps[-1] - window)
+            columns = {field: data[first:] for field, data in columns.items()}
+        return columns
+
+    def latest(self):
+        with self._lock:
+            if not self._count:
+                return None
+            i = (self._index - 1) % self.capacity
+            return {field: self._buffers[field][i] for field in self.FIELDS}
+
+    def percentile(self, p, field='percent', window=None):
+        _timestamps, data = self.values(field, window)
+        if not data:
+            return None
+        ordered = sorted(data)
+        rank = (len(ordered) - 1) * p / 100
+        lower = int(rank)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+    def min_max(self, field='percent', window=None):
+        _timestamps, data = self.values(field, window)
+        if not data:
+            return None, None
+        return min(data), max(data)
+
+    def slope(self, field='percent', window=None):
+        timestamps, data = self.values(field, window)
+        n = len(data)
+        if n < 2:
+            return 0.0
+        mean_t = sum(timestamps) / n
+        mean_v = sum(data) / n
+        numerator = 0.0
+        denominator = 0.0
+        for t, v in zip(timestamps, data):
+            dt = t - mean_t
+            numerator += dt * (v - mean_v)
+            denominator += dt * dt
+        return numerator / denominator if denominator else 0.0
+
 class RAMMonitor:
+    INIT_PROCESS_NAMES = {'systemd', 'init', 'launchd', 'wininit.exe', 'services.exe', 'explorer.exe'}
+
     def __init__(self):
         self.memory_info = None
         self.swap_info = None
         self.memory_processes = []
+        self.sampler = MemorySampler()
+        self.leak_candidates = []
+        self.pressure_info = None
+        self.fragmentation_info = None
 
     def get_memory_info(self):
         try:
@@ -17,29 +145,209 @@ class RAMMonitor:
             print_error(f"Erro ao obter informações de memória: {e}")
             return False
 
-    def get_top_memory_processes(self, limit=10):
+    def _iter_process_rss(self):
+        for proc in psutil.process_iter(['name', 'memory_info']):
+            memory_info = proc.info['memory_info']
+            if memory_info:
+                yield memory_info.rss, proc.pid, proc.info['name'] or '?'
+
+    def _get_process_full_memory(self, pid):
         try:
-            processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'memory_info']):
-                try:
-                    proc_info = proc.info
-                    if proc_info['memory_info']:
-                        processes.append({
-                            'pid': proc_info['pid'],
-                            'name': proc_info['name'],
-                            'memory': proc_info['memory_info'].rss
-                        })
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
-            processes.sort(key=lambda x: x['memory'], reverse=True)
-            self.memory_processes = processes[:limit]
+            full_info = psutil.Process(pid).memory_full_info()
+            return getattr(full_info, 'uss', None), getattr(full_info, 'pss', None)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess, OSError):
+            return None, None
+
+    def get_top_memory_processes(self, limit=10, detailed=False, max_workers=8):
+        try:
+            top = heapq.nlargest(limit, self._iter_process_rss(), key=lambda item: item[0])
+            self.memory_processes = [{'pid': pid, 'name': name, 'memory': rss} for rss, pid, name in top]
+
+            if detailed and self.memory_processes:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    full_memory = executor.map(self._get_process_full_memory, [p['pid'] for p in self.memory_processes])
+                    for proc, (uss, pss) in zip(self.memory_processes, full_memory):
+                        proc['uss'] = uss
+                        proc['pss'] = pss
             return True
         except Exception as e:
             print_error(f"Erro ao obter processos: {e}")
             return False
 
+    def _read_psi(self, path="/proc/pressure/memory"):
+        psi = {}
+        try:
+            with open(path) as f:
+                for line in f:
+                    fields = line.split()
+                    if not fields:
+                        continue
+                    values = dict(field.split("=", 1) for field in fields[1:])
+                    psi[fields[0]] = {key: float(value) for key, value in values.items()}
+        except (OSError, ValueError):
+            return None
+        return psi
+
+    def _read_vmstat(self):
+        vmstat = {}
+        try:
+            with open("/proc/vmstat") as f:
+                for line in f:
+                    key, _, value = line.partition(" ")
+                    vmstat[key] = int(value)
+        except (OSError, ValueError):
+            return {}
+        return vmstat
+
+    def sample_memory_pressure(self, interval=1.0):
+        psi_before = self._read_psi()
+        vmstat_before = self._read_vmstat()
+        if psi_before is None and not vmstat_before:
+            self.pressure_info = None
+            return None
+
+        start = time.perf_counter()
+        time.sleep(interval)
+        psi_after = self._read_psi()
+        vmstat_after = self._read_vmstat()
+        elapsed = time.perf_counter() - start
+
+        def vmstat_rate(key):
+            if key not in vmstat_before or key not in vmstat_after:
+                return None
+            return max(vmstat_after[key] - vmstat_before[key], 0) / elapsed
+
+        info = {
+            'major_faults_per_sec': vmstat_rate('pgmajfault'),
+            'swap_in_per_sec': vmstat_rate('pswpin'),
+            'swap_out_per_sec': vmstat_rate('pswpout'),
+            'psi': psi_after
+        }
+        if psi_before and psi_after:
+            for kind in ('some', 'full'):
+                if kind in psi_before and kind in psi_after:
+                    stalled_us = psi_after[kind]['total'] - psi_before[kind]['total']
+                    info[f'{kind}_stall_percent'] = min(stalled_us / (elapsed * 1e6) * 100, 100.0)
+
+        self.pressure_info = info
+        return info
+
+    def _is_init_like(self, process):
+        return process is None or process['pid'] <= 1 or process['name'] in self.INIT_PROCESS_NAMES
+
+    def get_process_tree_usage(self, limit=10):
+        processes = {}
+        for proc in psutil.process_iter(['pid', 'ppid', 'name', 'memory_info', 'cpu_times']):
+            info = proc.info
+            memory_info = info['memory_info']
+            cpu_times = info['cpu_times']
+            processes[info['pid']] = {
+                'pid': info['pid'],
+                'ppid': info['ppid'],
+                'name': info['name'] or '?',
+                'memory': memory_info.rss if memory_info else 0,
+                'cpu': cpu_times.user + cpu_times.system if cpu_times else 0.0
+            }
+
+        root_cache = {}
+
+        def find_root(pid):
+            chain = []
+            current = processes[pid]
+            while True:
+                if current['pid'] in root_cache:
+                    root = root_cache[current['pid']]
+                    break
+                chain.append(current['pid'])
+                parent = processes.get(current['ppid'])
+                if self._is_init_like(parent) or parent['pid'] in chain or len(chain) > 256:
+                    root = current['pid']
+                    break
+                current = parent
+            for member in chain:
+                root_cache[member] = root
+            return root
+
+        applications = {}
+        for pid, proc in processes.items():
+            if self._is_init_like(proc):
+                continue
+            root = processes[find_root(pid)]
+            app = applications.get(root['name'])
+            if app is None:
+                app = applications[root['name']] = {
+                    'name': root['name'],
+                    'root_pids': set(),
+                    'processes': 0,
+                    'self_memory': 0,
+                    'self_cpu': 0.0,
+                    'tree_memory': 0,
+                    'tree_cpu': 0.0
+                }
+            app['processes'] += 1
+            app['tree_memory'] += proc['memory']
+            app['tree_cpu'] += proc['cpu']
+            if pid == root['pid']:
+                app['root_pids'].add(pid)
+                app['self_memory'] += proc['memory']
+                app['self_cpu'] += proc['cpu']
+
+        return heapq.nlargest(limit, applications.values(), key=lambda app: app['tree_memory'])
+
+    def report_process_tree_usage(self, limit=10):
+        try:
+            applications = self.get_process_tree_usage(limit)
+        except Exception as e:
+            print_error(f"Erro ao montar árvore de processos: {e}")
+            return False
+
+        print_info(f"Top {limit} Aplicações (árvore de processos):")
+        rows = []
+        for i, app in enumerate(applications, 1):
+            root_pids = sorted(app['root_pids'])
+            pid_label = str(root_pids[0]) if len(root_pids) == 1 else f"{root_pids[0]} (+{len(root_pids) - 1})"
+            rows.append([
+                i,
+                app['name'][:30],
+                pid_label,
+                app['processes'],
+                format_bytes(app['self_memory']),
+                format_bytes(app['tree_memory']),
+                f"{app['self_cpu']:.1f}s",
+                f"{app['tree_cpu']:.1f}s"
+            ])
+        headers = ["#", "Aplicação", "PID raiz", "Processos", "Memória (própria)", "Memória (árvore)", "CPU (própria)", "CPU (árvore)"]
+        print(create_table(headers, rows))
+        return True
+
     def check_memory_pressure(self):
+        info = self.pressure_info
+        if info and info.get('psi'):
+            psi = info['psi']
+            full = max(psi.get('full', {}).get('avg10', 0.0), info.get('full_stall_percent', 0.0))
+            some = max(psi.get('some', {}).get('avg10', 0.0), info.get('some_stall_percent', 0.0))
+            swap_in = info.get('swap_in_per_sec') or 0.0
+
+            if full > 10 or some > 40:
+                return "CRÍTICO"
+            elif full > 2 or some > 10 or swap_in > 1000:
+                return "ALTO"
+            elif some > 1 or swap_in > 0:
+                return "MODERADO"
+            else:
+                return "NORMAL"
+
+        if info:
+            swap_in = info.get('swap_in_per_sec') or 0.0
+            major_faults = info.get('major_faults_per_sec') or 0.0
+            if swap_in > 1000 or major_faults > 1000:
+                return "CRÍTICO"
+            elif swap_in > 100 or major_faults > 100:
+                return "ALTO"
+            elif swap_in > 0 or major_faults > 10:
+                return "MODERADO"
+            return "NORMAL"
+
         if not self.memory_info:
             return "Unknown"
         
@@ -54,7 +362,110 @@ class RAMMonitor:
         else:
             return "NORMAL"
 
+    def _read_meminfo(self):
+        meminfo = {}
+        try:
+            with open("/proc/meminfo") as f:
+                for line in f:
+                    key, _, value = line.partition(":")
+                    meminfo[key] = int(value.split()[0])
+        except (OSError, ValueError, IndexError):
+            return {}
+        return meminfo
+
+    def _read_buddyinfo(self):
+        zones = []
+        try:
+            with open("/proc/buddyinfo") as f:
+                for line in f:
+                    head, _, counts = line.partition("zone")
+                    fields = counts.split()
+                    zones.append({
+                        'node': int(head.replace("Node", "").strip(" ,")),
+                        'zone': fields[0],
+                        'free_by_order': [int(c) for c in fields[1:]]
+                    })
+        except (OSError, ValueError, IndexError):
+            return []
+        return zones
+
+    def _read_pagetypeinfo(self):
+        info = {'pageblock_order': None, 'blocks': {}}
+        try:
+            with open("/proc/pagetypeinfo") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return info
+
+        block_types = []
+        for line in lines:
+            if line.startswith("Page block order:"):
+                info['pageblock_order'] = int(line.split(":")[1])
+            elif line.startswith("Number of blocks type"):
+                block_types = line.split()[4:]
+            elif block_types and line.startswith("Node"):
+                head, _, rest = line.partition("zone")
+                fields = rest.split()
+                node = int(head.replace("Node", "").strip(" ,"))
+                info['blocks'][(node, fields[0])] = dict(zip(block_types, (int(v) for v in fields[1:])))
+        return info
+
+    def _get_page_size(self):
+        try:
+            return os.sysconf('SC_PAGE_SIZE')
+        except (ValueError, OSError, AttributeError):
+            return 4096
+
+    def _get_huge_page_order(self, pagetypeinfo):
+        if pagetypeinfo.get('pageblock_order') is not None:
+            return pagetypeinfo['pageblock_order']
+        hugepage_kb = self._read_meminfo().get('Hugepagesize')
+        page_kb = self._get_page_size() // 1024
+        if hugepage_kb and page_kb:
+            return max((hugepage_kb // page_kb).bit_length() - 1, 0)
+        return 9
+
+    def get_fragmentation_report(self):
+        zones = self._read_buddyinfo()
+        if not zones:
+            self.fragmentation_info = None
+            return None
+
+        pagetypeinfo = self._read_pagetypeinfo()
+        huge_order = self._get_huge_page_order(pagetypeinfo)
+
+        for zone in zones:
+            counts = zone['free_by_order']
+            free_pages = sum(count << order for order, count in enumerate(counts))
+            huge_free_pages = sum(count << order for order, count in enumerate(counts) if order >= huge_order)
+            zone['free_pages'] = free_pages
+            zone['huge_blocks'] = huge_free_pages >> huge_order
+            zone['unusable_index'] = (free_pages - huge_free_pages) / free_pages if free_pages else 1.0
+            zone['pageblocks'] = pagetypeinfo['blocks'].get((zone['node'], zone['zone']), {})
+
+        vmstat = self._read_vmstat()
+        compaction_keys = ('compact_stall', 'compact_fail', 'compact_success',
+                           'compact_migrate_scanned', 'compact_free_scanned',
+                           'thp_fault_alloc', 'thp_fault_fallback')
+        self.fragmentation_info = {
+            'huge_order': huge_order,
+            'zones': zones,
+            'compaction': {key: vmstat[key] for key in compaction_keys if key in vmstat}
+        }
+        return self.fragmentation_info
+
     def analyze_memory_fragmentation(self):
+        info = self.fragmentation_info or self.get_fragmentation_report()
+        if info:
+            relevant = [z for z in info['zones'] if z['zone'] != "DMA" and z['free_pages']]
+            if relevant:
+                worst = max(z['unusable_index'] for z in relevant)
+                if worst > 0.9:
+                    return "ALTA"
+                elif worst > 0.5:
+                    return "MODERADA"
+                return "BAIXA"
+
         if not self.memory_info:
             return "Unknown"
         
@@ -68,26 +479,333 @@ class RAMMonitor:
         else:
             return "BAIXA"
 
-    def get_memory_usage_trend(self, duration=60):
-        usage_trend = []
-        start_time = time.time()
-        
-        while time.time() - start_time < duration:
-            try:
-                memory = psutil.virtual_memory()
-                usage_trend.append({
-                    'timestamp': time.time(),
-                    'percent': memory.percent,
-                    'used': memory.used,
-                    'available': memory.available
-                })
-                time.sleep(5)
-            except KeyboardInterrupt:
-                break
-            except Exception:
+    def report_memory_fragmentation(self):
+        info = self.get_fragmentation_report()
+        if not info:
+            return False
+
+        page_size = self._get_page_size()
+        huge_size = page_size << info['huge_order']
+
+        print_info(f"Fragmentação por zona (blocos livres por ordem; páginas enormes = ordem {info['huge_order']}, {format_bytes(huge_size)}):")
+        rows = []
+        for zone in info['zones']:
+            pageblocks = zone['pageblocks']
+            rows.append([
+                zone['node'],
+                zone['zone'],
+                format_bytes(zone['free_pages'] * page_size),
+                " ".join(str(c) for c in zone['free_by_order']),
+                zone['huge_blocks'],
+                f"{zone['unusable_index']:.2f}",
+                pageblocks.get('Unmovable', "N/A")
+            ])
+        headers = ["Nó", "Zona", "Livre", "Blocos por ordem (0→)", "Blocos enormes", "Índice inutilizável", "Pageblocks imóveis"]
+        print(create_table(headers, rows))
+
+        compaction = info['compaction']
+        if compaction:
+            print_info("Compactação de memória (desde o boot):")
+            labels = {
+                'compact_stall': "Stalls de compactação",
+                'compact_fail': "Compactações falhas",
+                'compact_success': "Compactações bem-sucedidas",
+                'compact_migrate_scanned': "Páginas varridas (migração)",
+                'compact_free_scanned': "Páginas varridas (livres)",
+                'thp_fault_alloc': "THP alocadas em page fault",
+                'thp_fault_fallback': "THP com fallback para páginas normais"
+            }
+            print(create_table(["Métrica", "Valor"], [[labels[k], v] for k, v in compaction.items()]))
+
+            stalls = compaction.get('compact_stall', 0)
+            if stalls and compaction.get('compact_fail', 0) > stalls * 0.5:
+                print_warning("Mais da metade das compactações diretas falharam - alocações de páginas enormes sofrem latência")
+            if compaction.get('thp_fault_fallback', 0) > compaction.get('thp_fault_alloc', 0):
+                print_warning("Fallbacks de THP superam alocações - memória fragmentada demais para páginas enormes")
+
+        return True
+
+    def _read_sysfs_choice(self, path):
+        try:
+            with open(path) as f:
+                content = f.read().strip()
+        except OSError:
+            return None
+        for option in content.split():
+            if option.startswith("[") and option.endswith("]"):
+                return option[1:-1]
+        return content
+
+    def _read_sysfs_int(self, path):
+        try:
+            with open(path) as f:
+                return int(f.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    def _read_process_huge_pages(self, pid):
+        try:
+            with open(f"/proc/{pid}/smaps_rollup") as f:
+                for line in f:
+                    if line.startswith("AnonHugePages:"):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError, IndexError):
+            pass
+        return None
+
+    def khugepaged_scan_window(self):
+        scan_sleep = self._read_sysfs_int("/sys/kernel/mm/transparent_hugepage/khugepaged/scan_sleep_millisecs")
+        return (scan_sleep if scan_sleep is not None else 10000) / 1000 + 1.0
+
+    def get_huge_pages_info(self, interval=None, limit=10, max_workers=8):
+        thp_dir = "/sys/kernel/mm/transparent_hugepage"
+        if not os.path.isdir(thp_dir):
+            return None
+
+        khugepaged_dir = os.path.join(thp_dir, "khugepaged")
+        scans_before = self._read_sysfs_int(os.path.join(khugepaged_dir, "full_scans"))
+        collapsed_before = self._read_sysfs_int(os.path.join(khugepaged_dir, "pages_collapsed"))
+        collapse_alloc_before = self._read_vmstat().get('thp_collapse_alloc')
+        start = time.perf_counter()
+
+        meminfo = self._read_meminfo()
+        if not self.memory_processes:
+            self.get_top_memory_processes(limit)
+        pids = [p['pid'] for p in self.memory_processes[:limit]]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            huge_by_pid = dict(zip(pids, executor.map(self._read_process_huge_pages, pids)))
+        processes = [
+            {'pid': p['pid'], 'name': p['name'], 'rss': p['memory'], 'anon_huge': huge_by_pid.get(p['pid'])}
+            for p in self.memory_processes[:limit]
+        ]
+
+        if interval:
+            remaining = interval - (time.perf_counter() - start)
+            if remaining > 0:
+                time.sleep(remaining)
+        elapsed = time.perf_counter() - start
+        scans_after = self._read_sysfs_int(os.path.join(khugepaged_dir, "full_scans"))
+        collapsed_after = self._read_sysfs_int(os.path.join(khugepaged_dir, "pages_collapsed"))
+        vmstat = self._read_vmstat()
+
+        def rate(before, after):
+            if not interval or before is None or after is None:
+                return None
+            return max(after - before, 0) / elapsed * 60
+
+        return {
+            'enabled': self._read_sysfs_choice(os.path.join(thp_dir, "enabled")),
+            'defrag': self._read_sysfs_choice(os.path.join(thp_dir, "defrag")),
+            'anon_huge_pages': meminfo.get('AnonHugePages', 0) * 1024,
+            'shmem_huge_pages': meminfo.get('ShmemHugePages', 0) * 1024,
+            'hugepages_total': meminfo.get('HugePages_Total', 0),
+            'hugepages_free': meminfo.get('HugePages_Free', 0),
+            'hugepages_rsvd': meminfo.get('HugePages_Rsvd', 0),
+            'hugepages_surp': meminfo.get('HugePages_Surp', 0),
+            'hugepage_size': meminfo.get('Hugepagesize', 0) * 1024,
+            'khugepaged_window': elapsed if interval else None,
+            'khugepaged_scans_per_min': rate(scans_before, scans_after),
+            'khugepaged_collapsed_per_min': rate(collapsed_before, collapsed_after),
+            'thp_collapse_alloc_per_min': rate(collapse_alloc_before, vmstat.get('thp_collapse_alloc')),
+            'thp_fault_alloc': vmstat.get('thp_fault_alloc'),
+            'thp_fault_fallback': vmstat.get('thp_fault_fallback'),
+            'processes': processes
+        }
+
+    def _huge_pages_warnings(self, info):
+        warnings = []
+        static_total = info['hugepages_total']
+        if static_total and info['hugepages_free'] == static_total and not info['hugepages_rsvd']:
+            reserved = format_bytes(static_total * info['hugepage_size'])
+            warnings.append(f"{static_total} HugePages estáticas ({reserved}) reservadas e nenhuma em uso - memória indisponível para o sistema")
+        if static_total and info['enabled'] == "always":
+            warnings.append("HugePages estáticas configuradas com THP em 'always' - cargas que usam hugetlbfs normalmente exigem THP 'madvise' ou 'never'")
+        if info['enabled'] == "always" and info['defrag'] == "always":
+            warnings.append("THP 'always' com defrag 'always' - page faults podem fazer compactação direta e gerar picos de latência")
+        if info['enabled'] == "never" and info['anon_huge_pages']:
+            warnings.append("THP desativado, mas ainda há AnonHugePages mapeadas de antes da mudança")
+        fallback = info.get('thp_fault_fallback') or 0
+        if fallback and fallback > (info.get('thp_fault_alloc') or 0):
+            warnings.append("Mais fallbacks que alocações de THP - memória fragmentada; avalie compactação ou defrag 'defer'")
+        collapsed_rate = info.get('khugepaged_collapsed_per_min')
+        if collapsed_rate and collapsed_rate > 6000:
+            warnings.append(f"khugepaged colapsando {collapsed_rate:.0f} páginas/min - consumo de CPU em segundo plano elevado")
+        return warnings
+
+    def report_huge_pages(self, interval=None, limit=10):
+        if interval:
+            print_info(f"Amostrando khugepaged por {interval:.0f}s...")
+        info = self.get_huge_pages_info(interval, limit)
+        if not info:
+            return False
+
+        print_info("Páginas Enormes (THP e HugePages):")
+        collapsed_rate = info['khugepaged_collapsed_per_min']
+        scan_rate = info['khugepaged_scans_per_min']
+        collapse_alloc_rate = info['thp_collapse_alloc_per_min']
+        rows = [
+            ["THP (enabled)", info['enabled'] or "N/A"],
+            ["THP (defrag)", info['defrag'] or "N/A"],
+            ["AnonHugePages", format_bytes(info['anon_huge_pages'])],
+            ["ShmemHugePages", format_bytes(info['shmem_huge_pages'])],
+            ["HugePages (total/livres/reservadas)", f"{info['hugepages_total']}/{info['hugepages_free']}/{info['hugepages_rsvd']}"],
+            ["Tamanho da HugePage", format_bytes(info['hugepage_size'])]
+        ]
+        if info['khugepaged_window'] is None:
+            rows.append(["Atividade do khugepaged", "não amostrada"])
+        else:
+            rows.extend([
+                ["khugepaged varreduras completas/min", f"{scan_rate:.2f}" if scan_rate is not None else "N/A"],
+                ["khugepaged páginas colapsadas/min", f"{collapsed_rate:.2f}" if collapsed_rate is not None else "N/A"],
+                ["thp_collapse_alloc/min", f"{collapse_alloc_rate:.2f}" if collapse_alloc_rate is not None else "N/A"],
+                ["Janela de amostragem", f"{info['khugepaged_window']:.0f}s"]
+            ])
+        print(create_table(["Métrica", "Valor"], rows))
+
+        process_rows = []
+        for proc in info['processes']:
+            anon_huge = proc['anon_huge']
+            process_rows.append([
+                proc['name'][:30],
+                proc['pid'],
+                format_bytes(proc['rss']),
+                format_bytes(anon_huge) if anon_huge is not None else "N/A",
+                format_percentage(anon_huge, proc['rss']) if anon_huge is not None else "N/A"
+            ])
+        if process_rows:
+            print_info("Uso de THP pelos maiores processos:")
+            print(create_table(["Processo", "PID", "RSS", "AnonHugePages", "% em THP"], process_rows))
+
+        for warning in self._huge_pages_warnings(info):
+            print_warning(warning)
+        return True
+
+    def start_sampler(self, interval=None):
+        if interval is not None:
+            self.sampler.interval = interval
+        self.sampler.start()
+        return self.sampler
+
+    def stop_sampler(self):
+        self.sampler.stop()
+
+    def get_memory_usage_trend(self, duration=60, timeout=None):
+        self.start_sampler()
+        deadline = time.time() + (timeout if timeout is not None else duration + self.sampler.interval * 2)
+        while time.time() < deadline:
+            timestamps, _data = self.sampler.values('timestamp')
+            if timestamps and time.time() - timestamps[0] >= duration:
                 break
-        
-        return usage_trend
+            time.sleep(min(self.sampler.interval, max(deadline - time.time(), 0.0)))
+
+        columns = self.sampler.snapshot(duration)
+        return [dict(zip(MemorySampler.FIELDS, row)) for row in zip(*(columns[field] for field in MemorySampler.FIELDS))]
+
+    def get_trend_summary(self, window=60):
+        low, high = self.sampler.min_max('percent', window)
+        return {
+            'p50': self.sampler.percentile(50, 'percent', window),
+            'p95': self.sampler.percentile(95, 'percent', window),
+            'min': low,
+            'max': high,
+            'slope_per_min': self.sampler.slope('percent', window) * 60
+        }
+
+    def _fit_growth(self, sums):
+        n, sum_t, sum_v, sum_tt, sum_tv, sum_vv = sums
+        denominator = n * sum_tt - sum_t * sum_t
+        if n < 2 or denominator <= 0:
+            return 0.0, 0.0
+        covariance = n * sum_tv - sum_t * sum_v
+        slope = covariance / denominator
+        variance_v = n * sum_vv - sum_v * sum_v
+        r2 = (covariance * covariance) / (denominator * variance_v) if variance_v > 0 else 0.0
+        return slope, r2
+
+    def detect_memory_leaks(self, duration=300, interval=1.0, limit=10, min_r2=0.8, min_samples=10):
+        series = {}
+        start = time.time()
+        last_sample = start
+
+        try:
+            while time.time() - start < duration:
+                last_sample = time.time()
+                t = last_sample - start
+                for proc in psutil.process_iter(['name', 'memory_info', 'create_time']):
+                    memory_info = proc.info['memory_info']
+                    if not memory_info:
+                        continue
+                    key = (proc.pid, proc.info['create_time'])
+                    entry = series.get(key)
+                    if entry is None:
+                        entry = series[key] = {
+                            'name': proc.info['name'] or '?',
+                            'first_rss': memory_info.rss,
+                            'sums': array('d', bytes(8 * 6)),
+                            'last_rss': memory_info.rss,
+                            'last_seen': 0.0
+                        }
+                    v = (memory_info.rss - entry['first_rss']) / (1024 * 1024)
+                    sums = entry['sums']
+                    sums[0] += 1
+                    sums[1] += t
+                    sums[2] += v
+                    sums[3] += t * t
+                    sums[4] += t * v
+                    sums[5] += v * v
+                    entry['last_rss'] = memory_info.rss
+                    entry['last_seen'] = last_sample
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            print()
+            print_info("Coleta interrompida pelo usuário - analisando amostras obtidas")
+
+        candidates = []
+        for (pid, _create_time), entry in series.items():
+            if entry['last_seen'] != last_sample or entry['sums'][0] < min_samples:
+                continue
+            slope, r2 = self._fit_growth(entry['sums'])
+            if slope <= 0 or r2 < min_r2:
+                continue
+            candidates.append({
+                'pid': pid,
+                'name': entry['name'],
+                'rss': entry['last_rss'],
+                'growth': entry['last_rss'] - entry['first_rss'],
+                'slope_mb_per_hour': slope * 3600,
+                'r2': r2
+            })
+
+        self.leak_candidates = heapq.nlargest(limit, candidates, key=lambda c: c['slope_mb_per_hour'])
+        return self.leak_candidates
+
+    def report_memory_leaks(self, duration=300, interval=1.0, limit=10):
+        print_header("Detecção de Vazamentos de Memória")
+        print_info(f"Amostrando memória de todos os processos por {duration} segundos... (Ctrl+C para encerrar antes)")
+
+        candidates = self.detect_memory_leaks(duration, interval, limit)
+        if not candidates:
+            print_success("Nenhum processo com crescimento contínuo de memória detectado")
+            return True
+
+        rows = []
+        for i, c in enumerate(candidates, 1):
+            uss, _pss = self._get_process_full_memory(c['pid'])
+            rows.append([
+                i,
+                c['name'][:30],
+                c['pid'],
+                format_bytes(c['rss']),
+                format_bytes(uss) if uss is not None else "N/A",
+                format_bytes(c['growth']),
+                f"{c['slope_mb_per_hour']:.1f} MB/h",
+                f"{c['r2']:.2f}"
+            ])
+
+        headers = ["#", "Processo", "PID", "RSS", "USS", "Crescimento", "Taxa", "R²"]
+        print(create_table(headers, rows))
+        print_warning("Processos com crescimento constante (R² alto) são fortes candidatos a vazamento de memória")
+        return True
 
     def optimize_memory(self):
         print_info("Otimizando uso de memória...")
@@ -102,7 +820,11 @@ class RAMMonitor:
         print_info("Sugestões de otimização:")
         print_info("1. Feche aplicações desnecessárias")
         print_info("2. Reinicie aplicações que consomem muita memória")
-        print_info("3. Verifique vazamentos de memória em aplicações")
+        if self.leak_candidates:
+            names = ", ".join(f"{c['name']} ({c['pid']})" for c in self.leak_candidates[:3])
+            print_info(f"3. Reinicie processos com possível vazamento de memória: {names}")
+        else:
+            print_info("3. Verifique vazamentos de memória em aplicações (detecção disponível no monitoramento de RAM)")
         print_info("4. Considere aumentar a memória virtual")
         
         return True
@@ -118,17 +840,21 @@ class RAMMonitor:
         
         if not self.get_memory_info():
             return False
+        self.get_fragmentation_report()
 
-        if not self.get_top_memory_processes():
+        if not self.get_top_memory_processes(detailed=True):
             return False
 
+        self.sample_memory_pressure(1.0)
+        pressure = self.check_memory_pressure()
+
         print_info("Informações Gerais de Memória:")
         memory_data = [
             ["Total", format_bytes(self.memory_info.total)],
             ["Disponível", format_bytes(self.memory_info.available)],
             ["Usado", format_bytes(self.memory_info.used)],
             ["Percentual de Uso", f"{self.memory_info.percent:.1f}%"],
-            ["Pressão de Memória", self.check_memory_pressure()],
+            ["Pressão de Memória", pressure],
             ["Fragmentação", self.analyze_memory_fragmentation()]
         ]
         
@@ -153,14 +879,35 @@ class RAMMonitor:
                 proc['name'][:30],
                 proc['pid'],
                 format_bytes(proc['memory']),
+                format_bytes(proc['uss']) if proc.get('uss') is not None else "N/A",
+                format_bytes(proc['pss']) if proc.get('pss') is not None else "N/A",
                 format_percentage(proc['memory'], self.memory_info.total)
             ])
         
-        headers = ["#", "Processo", "PID", "Memória", "% do Total"]
+        headers = ["#", "Processo", "PID", "RSS", "USS", "PSS", "% do Total"]
         print(create_table(headers, process_data))
 
+        self.report_process_tree_usage()
+
+        if self.pressure_info:
+            print_info("Indicadores de Pressão (amostra de 1s):")
+            pressure_data = []
+            psi = self.pressure_info.get('psi') or {}
+            for kind, label in (('some', 'Stall parcial (some)'), ('full', 'Stall total (full)')):
+                if kind in psi:
+                    values = psi[kind]
+                    pressure_data.append([
+                        label,
+                        f"{values['avg10']:.2f}% / {values['avg60']:.2f}% / {values['avg300']:.2f}% (10s/60s/300s)"
+                    ])
+            for key, label in (('major_faults_per_sec', 'Page faults maiores/s'),
+                               ('swap_in_per_sec', 'Swap-in (páginas/s)'),
+                               ('swap_out_per_sec', 'Swap-out (páginas/s)')):
+                if self.pressure_info.get(key) is not None:
+                    pressure_data.append([label, f"{self.pressure_info[key]:.1f}"])
+            print(create_table(["Métrica", "Valor"], pressure_data))
+
         print_info("Análise de Performance:")
-        pressure = self.check_memory_pressure()
         if pressure == "CRÍTICO":
             print_error("Memória em estado crítico - ação imediata necessária")
         elif pressure == "ALTO":
@@ -168,6 +915,9 @@ class RAMMonitor:
         else:
             print_success("Uso de memória normal")
 
+        self.report_memory_fragmentation()
+        self.report_huge_pages()
+
         fragmentation = self.analyze_memory_fragmentation()
         if fragmentation == "ALTA":
             print_warning("Fragmentação de memória alta detectada")
@@ -178,20 +928,27 @@ class RAMMonitor:
 
         return True
 
-    def monitor_realtime(self, duration=300):
+    def monitor_realtime(self, duration=300, refresh=1.0):
         print_header("Monitoramento em Tempo Real")
         print_info(f"Monitorando por {duration} segundos... (Ctrl+C para parar)")
         
+        was_running = self.sampler.is_running()
+        self.start_sampler()
         try:
             start_time = time.time()
             while time.time() - start_time < duration:
-                if self.get_memory_info():
-                    percent = self.memory_info.percent
-                    available = format_bytes(self.memory_info.available)
-                    
-                    print(f"\rUso: {percent:.1f}% | Disponível: {available}", end="", flush=True)
+                sample = self.sampler.latest()
+                if sample:
+                    summary = self.get_trend_summary(60)
+                    available = format_bytes(sample['available'])
+                    print(
+                        f"\rUso: {sample['percent']:.1f}% | Disponível: {available} | "
+                        f"p95 (60s): {summary['p95']:.1f}% | Mín/Máx: {summary['min']:.1f}%/{summary['max']:.1f}% | "
+                        f"Tendência: {summary['slope_per_min']:+.2f}%/min",
+                        end="", flush=True
+                    )
                 
-                time.sleep(2)
+                time.sleep(refresh)
             
             print()
             print_success("Monitoramento concluído")
@@ -199,5 +956,8 @@ class RAMMonitor:
         except KeyboardInterrupt:
             print()
             print_info("Monitoramento interrompido pelo usuário")
+        finally:
+            if not was_running:
+                self.stop_sampler()
         
-        return True 
\ No newline at end of file
+        return True
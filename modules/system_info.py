@@ -1,9 +1,11 @@
 import os
+import heapq
 import platform
 import psutil
 import subprocess
 import socket
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from .utils import print_header, print_success, print_error, print_info, print_warning, format_bytes, create_table, run_command, get_os_type
 
@@ -14,6 +16,7 @@ class SystemInfo:
         self.network_info = {}
         self.software_info = {}
         self.gpu_info = []
+        self.numa_info = {}
 
     def get_basic_system_info(self):
         try:
@@ -76,6 +79,170 @@ class SystemInfo:
             print_error(f"Erro ao obter informações de hardware: {e}")
             return False
 
+    def _parse_cpu_list(self, text):
+        cpus = []
+        for part in text.strip().split(","):
+            if not part:
+                continue
+            if "-" in part:
+                start, end = part.split("-")
+                cpus.extend(range(int(start), int(end) + 1))
+            else:
+                cpus.append(int(part))
+        return cpus
+
+    def _read_node_file(self, node_dir, name):
+        try:
+            with open(os.path.join(node_dir, name)) as f:
+                return f.read()
+        except OSError:
+            return ""
+
+    def get_numa_info(self):
+        base = "/sys/devices/system/node"
+        if not os.path.isdir(base):
+            self.numa_info = {}
+            return False
+
+        nodes = []
+        cpu_to_node = {}
+        for entry in sorted(os.listdir(base)):
+            if not entry.startswith("node") or not entry[4:].isdigit():
+                continue
+            node_id = int(entry[4:])
+            node_dir = os.path.join(base, entry)
+
+            meminfo = {}
+            for line in self._read_node_file(node_dir, "meminfo").splitlines():
+                fields = line.split()
+                if len(fields) >= 4:
+                    meminfo[fields[2].rstrip(":")] = int(fields[3]) * 1024
+
+            numastat = {}
+            for line in self._read_node_file(node_dir, "numastat").splitlines():
+                key, _, value = line.partition(" ")
+                if value.strip().isdigit():
+                    numastat[key] = int(value)
+
+            cpus = self._parse_cpu_list(self._read_node_file(node_dir, "cpulist"))
+            for cpu in cpus:
+                cpu_to_node[cpu] = node_id
+
+            nodes.append({
+                'node': node_id,
+                'cpus': cpus,
+                'mem_total': meminfo.get('MemTotal', 0),
+                'mem_free': meminfo.get('MemFree', 0),
+                'numastat': numastat,
+                'distance': self._read_node_file(node_dir, "distance").split()
+            })
+
+        self.numa_info = {'nodes': nodes, 'cpu_to_node': cpu_to_node}
+        return bool(nodes)
+
+    def _read_process_numa_memory(self, pid):
+        per_node = {}
+        try:
+            with open(f"/proc/{pid}/numa_maps") as f:
+                for line in f:
+                    page_size = 4096
+                    node_pages = []
+                    for field in line.split()[2:]:
+                        if field.startswith("kernelpagesize_kB="):
+                            page_size = int(field.split("=")[1]) * 1024
+                        elif field.startswith("N") and "=" in field:
+                            node, _, pages = field[1:].partition("=")
+                            node_pages.append((int(node), int(pages)))
+                    for node, pages in node_pages:
+                        per_node[node] = per_node.get(node, 0) + pages * page_size
+        except (OSError, ValueError):
+            return None
+        return per_node
+
+    def get_numa_process_locality(self, limit=10, max_workers=8):
+        cpu_to_node = self.numa_info.get('cpu_to_node', {})
+
+        def iter_processes():
+            for proc in psutil.process_iter(['name', 'memory_info', 'cpu_num']):
+                memory_info = proc.info['memory_info']
+                if memory_info:
+                    yield memory_info.rss, proc.pid, proc.info['name'] or '?', proc.info['cpu_num']
+
+        top = heapq.nlargest(limit, iter_processes(), key=lambda item: item[0])
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            numa_memory = list(executor.map(self._read_process_numa_memory, [item[1] for item in top]))
+
+        processes = []
+        for (rss, pid, name, cpu_num), per_node in zip(top, numa_memory):
+            if not per_node:
+                continue
+            home_node = cpu_to_node.get(cpu_num)
+            total = sum(per_node.values())
+            remote = total - per_node.get(home_node, 0) if home_node is not None else 0
+            processes.append({
+                'pid': pid,
+                'name': name,
+                'rss': rss,
+                'home_node': home_node,
+                'per_node': per_node,
+                'remote_percent': remote / total * 100 if total else 0.0
+            })
+        return processes
+
+    def report_numa(self, limit=10):
+        if not self.get_numa_info():
+            return False
+
+        nodes = self.numa_info['nodes']
+        print_info("Topologia NUMA:")
+        node_rows = []
+        for node in nodes:
+            stats = node['numastat']
+            node_rows.append([
+                node['node'],
+                len(node['cpus']),
+                format_bytes(node['mem_total']),
+                format_bytes(node['mem_free']),
+                stats.get('numa_hit', 'N/A'),
+                stats.get('numa_miss', 'N/A'),
+                stats.get('other_node', 'N/A'),
+                " ".join(node['distance'])
+            ])
+        headers = ["Nó", "CPUs", "Memória", "Livre", "numa_hit", "numa_miss", "other_node", "Distâncias"]
+        print(create_table(headers, node_rows))
+
+        if len(nodes) < 2:
+            print_info("Sistema com um único nó NUMA - sem acesso remoto de memória")
+            return True
+
+        for node in nodes:
+            stats = node['numastat']
+            hits = stats.get('numa_hit', 0)
+            misses = stats.get('numa_miss', 0)
+            if hits + misses and misses / (hits + misses) > 0.05:
+                print_warning(f"Nó {node['node']}: {misses / (hits + misses) * 100:.1f}% das alocações caíram em outro nó (numa_miss)")
+
+        processes = self.get_numa_process_locality(limit)
+        if processes:
+            print_info("Memória por nó dos maiores processos:")
+            process_rows = []
+            for proc in processes:
+                distribution = " ".join(f"N{node}={format_bytes(size)}" for node, size in sorted(proc['per_node'].items()))
+                process_rows.append([
+                    proc['name'][:30],
+                    proc['pid'],
+                    proc['home_node'] if proc['home_node'] is not None else "N/A",
+                    distribution,
+                    f"{proc['remote_percent']:.1f}%"
+                ])
+            print(create_table(["Processo", "PID", "Nó da CPU", "Memória por nó", "Remota"], process_rows))
+
+            for proc in processes:
+                if proc['remote_percent'] > 50:
+                    print_warning(f"{proc['name']} (PID {proc['pid']}) executa no nó {proc['home_node']} com {proc['remote_percent']:.0f}% da memória em nó remoto")
+
+        return True
+
     def get_network_info(self):
         try:
             network_interfaces = []
@@ -354,6 +521,8 @@ class SystemInfo:
             headers = ["GPU", "Versão do Driver"]
             print(create_table(headers, gpu_data))
 
+        self.report_numa()
+
         print_info("Informações de Disco:")
         disk_data = []
         for disk in self.hardware_info['disks']:
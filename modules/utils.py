@@ -84,6 +84,16 @@ def ensure_directory_exists(directory):
         return True
     return False
 
+def get_data_directory():
+    if is_windows():
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        directory = os.path.join(base, "TerminalTec")
+    else:
+        base = os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+        directory = os.path.join(base, "terminaltec")
+    ensure_directory_exists(directory)
+    return directory
+
 def get_safe_filename(filename):
     invalid_chars = '<>:"/\\|?*'
     for char in invalid_chars:
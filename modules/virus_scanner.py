@@ -1,7 +1,9 @@
 import os
+import heapq
 import subprocess
 import time
-from .utils import print_header, print_success, print_error, print_info, print_warning, run_command, get_os_type, create_table
+import psutil
+from .utils import print_header, print_success, print_error, print_info, print_warning, run_command, get_os_type, create_table, format_bytes
 
 class VirusScanner:
     def __init__(self):
@@ -165,12 +167,88 @@ class VirusScanner:
                 if success:
                     print_info("Top 10 processos por memória:")
                     print(output)
+
+            top_io = self.sample_process_io(1.0, 10)
+            if top_io:
+                print_info("Top 10 processos por I/O de disco (amostra de 1s):")
+                print(self._process_io_table(top_io))
             
             return True
         except Exception as e:
             print_error(f"Erro ao verificar processos: {e}")
             return False
 
+    def _read_process_io(self):
+        snapshot = {}
+        for proc in psutil.process_iter(['name', 'io_counters', 'create_time']):
+            io = proc.info['io_counters']
+            if io is None:
+                continue
+            snapshot[(proc.pid, proc.info['create_time'])] = (proc.info['name'] or '?', io.read_bytes, io.write_bytes)
+        return snapshot
+
+    def _compute_process_io_rates(self, previous, current, elapsed, limit):
+        rates = []
+        for key, (name, read_bytes, write_bytes) in current.items():
+            prev = previous.get(key)
+            if prev is None:
+                continue
+            read_delta = read_bytes - prev[1]
+            write_delta = write_bytes - prev[2]
+            if read_delta < 0 or write_delta < 0 or (read_delta == 0 and write_delta == 0):
+                continue
+            rates.append((read_delta / elapsed, write_delta / elapsed, key[0], name))
+        return heapq.nlargest(limit, rates, key=lambda r: r[0] + r[1])
+
+    def sample_process_io(self, interval=1.0, limit=10):
+        try:
+            previous = self._read_process_io()
+            start = time.perf_counter()
+            time.sleep(interval)
+            current = self._read_process_io()
+            elapsed = time.perf_counter() - start
+        except Exception as e:
+            print_warning(f"Não foi possível amostrar I/O por processo: {e}")
+            return []
+
+        return self._compute_process_io_rates(previous, current, elapsed, limit)
+
+    def _process_io_table(self, rates):
+        rows = []
+        for i, (read_rate, write_rate, pid, name) in enumerate(rates, 1):
+            rows.append([i, name[:30], pid, f"{format_bytes(read_rate)}/s", f"{format_bytes(write_rate)}/s"])
+        headers = ["#", "Processo", "PID", "Leitura", "Escrita"]
+        return create_table(headers, rows)
+
+    def monitor_process_io(self, duration=60, interval=2.0, limit=10):
+        print_header("I/O de Disco por Processo")
+        print_info(f"Monitorando por {duration} segundos... (Ctrl+C para parar)")
+
+        try:
+            previous = self._read_process_io()
+            last = time.perf_counter()
+            end_time = last + duration
+            while time.perf_counter() < end_time:
+                time.sleep(interval)
+                current = self._read_process_io()
+                now = time.perf_counter()
+                rates = self._compute_process_io_rates(previous, current, now - last, limit)
+                previous, last = current, now
+
+                print("\033[2J\033[H", end="")
+                print_header("I/O de Disco por Processo")
+                if rates:
+                    print(self._process_io_table(rates))
+                else:
+                    print_info("Nenhuma atividade de I/O no intervalo")
+
+            print_success("Monitoramento concluído")
+        except KeyboardInterrupt:
+            print()
+            print_info("Monitoramento interrompido pelo usuário")
+
+        return True
+
     def check_startup_programs(self):
         try:
             print_info("Verificando programas de inicialização...")
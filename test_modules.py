@@ -60,6 +60,7 @@ def main():
         ('Virus Scanner', 'modules.virus_scanner', 'VirusScanner'),
         ('Memory Tester', 'modules.memory_tester', 'MemoryTester'),
         ('Disk Checker', 'modules.disk_checker', 'DiskChecker'),
+        ('Cgroup Monitor', 'modules.cgroup_monitor', 'CgroupMonitor'),
     ]
     
     successful = 0